@@ -5,11 +5,23 @@ Used for review on Stop.
 Uses session-isolated logs to handle concurrency.
 """
 
-import json
+import atexit
 import os
+import stat
 import sys
-from datetime import datetime
-from pathlib import Path
+import time
+
+# Prompts are truncated to this many characters in the log
+MAX_PROMPT_CHARS = 500
+
+# [epoch second, "YYYY-MM-DDTHH:MM:SS"] for the last formatted timestamp
+_TS_CACHE = [-1, ""]
+
+_LOG_FLAGS = (
+    os.O_WRONLY | os.O_APPEND | os.O_CREAT
+    | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+)
+_LOG_FDS: dict = {}
 
 
 def get_session_id() -> str:
@@ -17,35 +29,90 @@ def get_session_id() -> str:
     return os.environ.get("CLAUDE_CODE_SSE_PORT", "default")
 
 
+LOG_FILE = os.path.join(".claude", "state", f"session-{get_session_id()}.log")
+
+
+def format_timestamp(now: float) -> str:
+    """Format a time.time() value as a local ISO-8601 timestamp with microseconds."""
+    sec = int(now)
+    if sec != _TS_CACHE[0]:
+        _TS_CACHE[0] = sec
+        _TS_CACHE[1] = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+    return f"{_TS_CACHE[1]}.{int((now - sec) * 1_000_000):06d}"
+
+
+def open_log(log_file: str) -> int:
+    """Return an append-only fd for log_file, opened once per process.
+
+    The state directory is only created when the first open hits ENOENT.
+    """
+    fd = _LOG_FDS.get(log_file)
+    if fd is None:
+        try:
+            fd = os.open(log_file, _LOG_FLAGS, 0o644)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            fd = os.open(log_file, _LOG_FLAGS, 0o644)
+        _LOG_FDS[log_file] = fd
+        atexit.register(os.close, fd)
+    return fd
+
+
 def write_log(prompt: str) -> None:
     """Write prompt to session log file."""
-    log_dir = Path(".claude/state")
-    session_id = get_session_id()
-    log_file = log_dir / f"session-{session_id}.log"
+    parts = (
+        f"[{format_timestamp(time.time())}] ".encode("ascii"),
+        prompt[:MAX_PROMPT_CHARS].encode("utf-8", "replace"),
+        b"\n",
+    )
 
-    log_dir.mkdir(parents=True, exist_ok=True)
+    # The whole entry lands in a single O_APPEND write, so concurrent hook
+    # processes never interleave partial lines.
+    fd = open_log(LOG_FILE)
+    if hasattr(os, "writev"):
+        os.writev(fd, parts)
+    else:  # Windows
+        os.write(fd, b"".join(parts))
 
-    timestamp = datetime.now().isoformat()
-    entry = f"[{timestamp}] {prompt[:500]}\n"
 
-    with open(log_file, "a", encoding="utf-8") as f:
-        f.write(entry)
+def read_stdin() -> bytes:
+    """Read the hook payload; terminals, /dev/null and empty files yield b""."""
+    try:
+        st = os.fstat(0)
+    except OSError:
+        return b""
+    if stat.S_ISCHR(st.st_mode) or (stat.S_ISREG(st.st_mode) and st.st_size == 0):
+        return b""
+    try:
+        return sys.stdin.buffer.read()
+    except Exception:
+        return b""
 
 
 def main():
-    input_data = ""
-    if not sys.stdin.isatty():
+    input_data = read_stdin()
+    if not input_data:
+        return
+
+    # Only a JSON object can carry "prompt"; anything else is plain text and
+    # skips both the json import (json, re, enum) and a failing parse.
+    prompt = None
+    parsed = False
+    if input_data.lstrip()[:1] == b"{":
+        import json
+
+        # json.loads accepts UTF-8 bytes directly, so the payload is decoded once
         try:
-            input_data = sys.stdin.read()
-        except Exception:
+            prompt = json.loads(input_data).get("prompt", "")
+            parsed = True
+        except (json.JSONDecodeError, UnicodeDecodeError):
             pass
 
-    prompt = ""
-    try:
-        data = json.loads(input_data)
-        prompt = data.get("prompt", "")
-    except json.JSONDecodeError:
-        prompt = input_data.strip()
+    # A JSON payload without a usable prompt is not logged as plain text
+    if not parsed:
+        # UTF-8 needs at most 4 bytes per character, so this prefix always
+        # decodes to at least MAX_PROMPT_CHARS intact characters.
+        prompt = input_data.strip()[:MAX_PROMPT_CHARS * 4].decode("utf-8", "replace")
 
     if prompt:
         write_log(prompt)
@@ -8,14 +8,15 @@ and record what happened. Designed to be small, readable, and predictable.
 from __future__ import annotations
 
 import argparse
+import functools
 import json
 import os
 import shutil
-import subprocess
+import stat
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
 
 try:
     import jsonschema
@@ -25,10 +26,28 @@ except ImportError:  # pragma: no cover
 DEFAULT_INSTALL_DIR = "~/.claude"
 SETTINGS_FILE = "settings.json"
 
+# merge_dir batches at least this large are copied on a thread pool
+_PARALLEL_COPY_MIN = 16
+_PARALLEL_COPY_WORKERS = 8
+
+# id(schema) -> (schema, validator); the schema is kept to guard against id reuse
+_VALIDATOR_CACHE: Dict[int, tuple] = {}
+
+# Directories already created by this process. Cleared whenever the installer
+# removes paths, so a directory deleted by uninstall/rollback is recreated.
+_DIRS_CREATED: Set[str] = set()
+
+
+def _ensure_dir(path: Path) -> None:
+    """mkdir -p, done at most once per directory per process."""
+    key = str(path)
+    if key not in _DIRS_CREATED:
+        path.mkdir(parents=True, exist_ok=True)
+        _DIRS_CREATED.add(key)
+
 
 def _ensure_list(ctx: Dict[str, Any], key: str) -> List[Any]:
-    ctx.setdefault(key, [])
-    return ctx[key]
+    return ctx.setdefault(key, [])
 
 
 def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
@@ -89,20 +108,64 @@ def parse_args(argv: Optional[Iterable[str]] = None) -> argparse.Namespace:
 
 def _load_json(path: Path) -> Any:
     try:
-        with path.open("r", encoding="utf-8") as fh:
-            return json.load(fh)
+        # json.loads decodes UTF-8 bytes itself; skip the text-mode wrapper
+        return json.loads(path.read_bytes())
     except FileNotFoundError as exc:
         raise FileNotFoundError(f"File not found: {path}") from exc
     except json.JSONDecodeError as exc:
         raise ValueError(f"Invalid JSON in {path}: {exc}") from exc
 
 
-def _save_json(path: Path, data: Any) -> None:
-    """Save data to JSON file with proper formatting."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as fh:
-        json.dump(data, fh, indent=2, ensure_ascii=False)
-        fh.write("\n")
+@functools.lru_cache(maxsize=64)
+def _load_json_snapshot(path: str, mtime_ns: int, size: int) -> Any:
+    return _load_json(Path(path))
+
+
+def _load_json_cached(path: Path) -> Any:
+    """Load JSON memoized on (path, mtime, size) for read-only callers.
+
+    The returned object is shared across calls and must not be mutated.
+    """
+    try:
+        st = path.stat()
+    except FileNotFoundError as exc:
+        raise FileNotFoundError(f"File not found: {path}") from exc
+    return _load_json_snapshot(str(path), st.st_mtime_ns, st.st_size)
+
+
+def _save_json(path: Path, data: Any, new_mode: int = 0o644) -> None:
+    """Save data to JSON file with proper formatting.
+
+    Writes to a sibling temp file and renames it over the target, so readers
+    never observe a truncated file. Symlinked targets are written through.
+    An existing target keeps its permission bits; a new one gets new_mode
+    (subject to the umask).
+    """
+    if path.is_symlink():
+        path = path.resolve()
+    _ensure_dir(path.parent)
+    text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        mode = stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+    tmp.unlink(missing_ok=True)
+    try:
+        # Create the temp file private when the final mode is copied over
+        # later, so secrets in models.json are never briefly world-readable.
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600 if mode is not None else new_mode)
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(text.encode("utf-8"))
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    # Same-size rewrites within the filesystem's mtime granularity would
+    # otherwise be served stale from the read cache.
+    _load_json_snapshot.cache_clear()
 
 
 # =============================================================================
@@ -110,20 +173,41 @@ def _save_json(path: Path, data: Any) -> None:
 # =============================================================================
 
 def load_settings(ctx: Dict[str, Any]) -> Dict[str, Any]:
-    """Load settings.json from install directory."""
+    """Load settings.json from install directory.
+
+    Parsed once per run and kept in ctx; see save_settings/flush_settings.
+    """
+    settings = ctx.get("_settings_cache")
+    if settings is not None:
+        return settings
+
+    settings = {}
     settings_path = ctx["install_dir"] / SETTINGS_FILE
     if settings_path.exists():
         try:
-            return _load_json(settings_path)
+            settings = _load_json(settings_path)
         except (ValueError, FileNotFoundError):
-            return {}
-    return {}
+            settings = {}
+    ctx["_settings_cache"] = settings
+    return settings
 
 
 def save_settings(ctx: Dict[str, Any], settings: Dict[str, Any]) -> None:
-    """Save settings.json to install directory."""
-    settings_path = ctx["install_dir"] / SETTINGS_FILE
-    _save_json(settings_path, settings)
+    """Stage settings.json for writing; flush_settings() persists it."""
+    ctx["_settings_cache"] = settings
+    ctx["_settings_dirty"] = True
+
+
+def _models_path() -> Path:
+    return Path.home() / ".codeagent" / "models.json"
+
+
+def flush_settings(ctx: Dict[str, Any]) -> None:
+    """Write staged settings.json and models.json changes, if any."""
+    if ctx.pop("_settings_dirty", False):
+        _save_json(ctx["install_dir"] / SETTINGS_FILE, ctx["_settings_cache"])
+    if ctx.pop("_models_dirty", False):
+        _save_json(_models_path(), ctx["_models_cache"], new_mode=0o600)
 
 
 def find_module_hooks(module_name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> List[tuple]:
@@ -135,32 +219,39 @@ def find_module_hooks(module_name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]
     2. {target_dir}/hooks.json (for hooks directory itself)
     """
     results = []
-    seen_paths = set()
+    seen: Set[tuple] = set()
 
     # Check for hooks in operations (copy_dir targets)
     for op in cfg.get("operations", []):
         if op.get("type") == "copy_dir":
-            target_dir = ctx["install_dir"] / op["target"]
-            source_dir = ctx["config_dir"] / op["source"]
+            target_dir = str(ctx["install_dir"] / op["target"])
+            source_dir = str(ctx["config_dir"] / op["source"])
 
             # Check both target and source directories
-            for base_dir, plugin_root in [(target_dir, str(target_dir)), (source_dir, str(target_dir))]:
-                # First check {dir}/hooks/hooks.json (for skills)
-                hooks_file = base_dir / "hooks" / "hooks.json"
-                if hooks_file.exists() and str(hooks_file) not in seen_paths:
-                    try:
-                        results.append((_load_json(hooks_file), plugin_root))
-                        seen_paths.add(str(hooks_file))
-                    except (ValueError, FileNotFoundError):
-                        pass
+            for base_dir in (target_dir, source_dir):
+                # One directory listing instead of an exists() probe per candidate
+                try:
+                    with os.scandir(base_dir) as it:
+                        names = {entry.name for entry in it}
+                except OSError:
+                    continue
 
-                # Then check {dir}/hooks.json (for hooks directory itself)
-                hooks_file = base_dir / "hooks.json"
-                if hooks_file.exists() and str(hooks_file) not in seen_paths:
+                # First {dir}/hooks/hooks.json (for skills),
+                # then {dir}/hooks.json (for hooks directory itself)
+                candidates = []
+                if "hooks" in names:
+                    candidates.append(("hooks", "hooks.json"))
+                if "hooks.json" in names:
+                    candidates.append(("hooks.json",))
+
+                for rel in candidates:
+                    key = (base_dir, rel)
+                    if key in seen:
+                        continue
                     try:
-                        results.append((_load_json(hooks_file), plugin_root))
-                        seen_paths.add(str(hooks_file))
-                    except (ValueError, FileNotFoundError):
+                        results.append((_load_json_cached(Path(base_dir, *rel)), target_dir))
+                        seen.add(key)
+                    except (ValueError, OSError):
                         pass
 
     return results
@@ -172,13 +263,33 @@ def _create_hook_marker(module_name: str) -> str:
 
 
 def _replace_hook_variables(obj: Any, plugin_root: str) -> Any:
-    """Recursively replace ${CLAUDE_PLUGIN_ROOT} in hook config."""
+    """Recursively replace ${CLAUDE_PLUGIN_ROOT} in hook config.
+
+    Only containers on the path to a replaced string are copied; anything
+    without the placeholder is returned as-is, and the input is never mutated.
+    """
     if isinstance(obj, str):
-        return obj.replace("${CLAUDE_PLUGIN_ROOT}", plugin_root)
+        if "${CLAUDE_PLUGIN_ROOT}" in obj:
+            return obj.replace("${CLAUDE_PLUGIN_ROOT}", plugin_root)
+        return obj
     elif isinstance(obj, dict):
-        return {k: _replace_hook_variables(v, plugin_root) for k, v in obj.items()}
+        copied = None
+        for k, v in obj.items():
+            new = _replace_hook_variables(v, plugin_root)
+            if new is not v:
+                if copied is None:
+                    copied = dict(obj)
+                copied[k] = new
+        return obj if copied is None else copied
     elif isinstance(obj, list):
-        return [_replace_hook_variables(item, plugin_root) for item in obj]
+        copied = None
+        for i, item in enumerate(obj):
+            new = _replace_hook_variables(item, plugin_root)
+            if new is not item:
+                if copied is None:
+                    copied = list(obj)
+                copied[i] = new
+        return obj if copied is None else copied
     return obj
 
 
@@ -195,24 +306,22 @@ def merge_hooks_to_settings(module_name: str, hooks_config: Dict[str, Any], ctx:
         module_hooks = _replace_hook_variables(module_hooks, plugin_root)
 
     for hook_type, hook_entries in module_hooks.items():
-        settings["hooks"].setdefault(hook_type, [])
+        type_entries = settings["hooks"].setdefault(hook_type, [])
+        # Canonical keys of this module's hooks already present (avoid duplicates)
+        seen = {
+            _hook_key(existing)
+            for existing in type_entries
+            if existing.get("__module__") == module_name
+        }
 
         for entry in hook_entries:
+            # _hook_key ignores __module__, so check before copying the entry
+            key = _hook_key(entry)
+            if key in seen:
+                continue
             # Add marker to identify this hook's source module
-            entry_copy = dict(entry)
-            entry_copy["__module__"] = module_name
-
-            # Check if already exists (avoid duplicates)
-            exists = False
-            for existing in settings["hooks"][hook_type]:
-                if existing.get("__module__") == module_name:
-                    # Same module, check if same hook
-                    if _hooks_equal(existing, entry_copy):
-                        exists = True
-                        break
-
-            if not exists:
-                settings["hooks"][hook_type].append(entry_copy)
+            type_entries.append({**entry, "__module__": module_name})
+            seen.add(key)
 
     save_settings(ctx, settings)
     write_log({"level": "INFO", "message": f"Merged hooks for module: {module_name}"}, ctx)
@@ -246,17 +355,17 @@ def unmerge_hooks_from_settings(module_name: str, ctx: Dict[str, Any]) -> None:
 
 def merge_agents_to_models(module_name: str, agents: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     """Merge module agent configs into ~/.codeagent/models.json."""
-    models_path = Path.home() / ".codeagent" / "models.json"
-    models_path.parent.mkdir(parents=True, exist_ok=True)
+    models_path = _models_path()
+    models = ctx.get("_models_cache")
 
-    if models_path.exists():
-        with models_path.open("r", encoding="utf-8") as fh:
-            models = json.load(fh)
+    if models is not None:
+        pass
+    elif models_path.exists():
+        models = _load_json(models_path)
     else:
         template = ctx["config_dir"] / "templates" / "models.json.example"
         if template.exists():
-            with template.open("r", encoding="utf-8") as fh:
-                models = json.load(fh)
+            models = _load_json(template)
             # Clear template agents so modules populate with __module__ tags
             models["agents"] = {}
         else:
@@ -276,8 +385,8 @@ def merge_agents_to_models(module_name: str, agents: Dict[str, Any], ctx: Dict[s
         if not existing or existing.get("__module__"):
             models["agents"][agent_name] = entry
 
-    with models_path.open("w", encoding="utf-8") as fh:
-        json.dump(models, fh, indent=2, ensure_ascii=False)
+    ctx["_models_cache"] = models
+    ctx["_models_dirty"] = True
 
     write_log(
         {
@@ -297,12 +406,13 @@ def unmerge_agents_from_models(module_name: str, ctx: Dict[str, Any]) -> None:
     If another installed module also declares a removed agent, restore that
     module's version so shared agents (e.g. 'develop') are not lost.
     """
-    models_path = Path.home() / ".codeagent" / "models.json"
-    if not models_path.exists():
-        return
-
-    with models_path.open("r", encoding="utf-8") as fh:
-        models = json.load(fh)
+    models = ctx.get("_models_cache")
+    if models is None:
+        models_path = _models_path()
+        if not models_path.exists():
+            return
+        models = _load_json(models_path)
+        ctx["_models_cache"] = models
 
     agents = models.get("agents", {})
     to_remove = [
@@ -316,27 +426,29 @@ def unmerge_agents_from_models(module_name: str, ctx: Dict[str, Any]) -> None:
 
     # Load config to find other modules that declare the same agents
     config_path = ctx["config_dir"] / "config.json"
-    config = _load_json(config_path) if config_path.exists() else {}
-    installed = load_installed_status(ctx).get("modules", {})
+    config = _load_json_cached(config_path) if config_path.exists() else {}
+    installed = load_installed_status(ctx, cached=True).get("modules", {})
+
+    # First other successfully installed module declaring each agent
+    owners: Dict[str, tuple] = {}
+    config_modules = config.get("modules", {})
+    for other_mod, other_status in installed.items():
+        if other_mod == module_name or other_status.get("status") != "success":
+            continue
+        other_agents = config_modules.get(other_mod, {}).get("agents", {})
+        for agent_name, agent_cfg in other_agents.items():
+            owners.setdefault(agent_name, (other_mod, agent_cfg))
 
     for name in to_remove:
         del agents[name]
-        # Check if another installed module also declares this agent
-        for other_mod, other_status in installed.items():
-            if other_mod == module_name:
-                continue
-            if other_status.get("status") != "success":
-                continue
-            other_cfg = config.get("modules", {}).get(other_mod, {})
-            other_agents = other_cfg.get("agents", {})
-            if name in other_agents:
-                restored = dict(other_agents[name])
-                restored["__module__"] = other_mod
-                agents[name] = restored
-                break
+        # Restore another installed module's version of this agent, if any
+        if name in owners:
+            other_mod, agent_cfg = owners[name]
+            restored = dict(agent_cfg)
+            restored["__module__"] = other_mod
+            agents[name] = restored
 
-    with models_path.open("w", encoding="utf-8") as fh:
-        json.dump(models, fh, indent=2, ensure_ascii=False)
+    ctx["_models_dirty"] = True
 
     write_log(
         {
@@ -350,11 +462,25 @@ def unmerge_agents_from_models(module_name: str, ctx: Dict[str, Any]) -> None:
     )
 
 
-def _hooks_equal(hook1: Dict[str, Any], hook2: Dict[str, Any]) -> bool:
-    """Compare two hooks ignoring the __module__ marker."""
-    h1 = {k: v for k, v in hook1.items() if k != "__module__"}
-    h2 = {k: v for k, v in hook2.items() if k != "__module__"}
-    return h1 == h2
+def _hook_key(hook: Dict[str, Any]) -> str:
+    """Canonical form of a hook for dedup, ignoring the __module__ marker."""
+    return json.dumps(
+        {k: v for k, v in hook.items() if k != "__module__"},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+
+
+def _get_validator(schema: Dict[str, Any]) -> Any:
+    """Return a validator for schema, checked and built once per process."""
+    cached = _VALIDATOR_CACHE.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+    cls = jsonschema.validators.validator_for(schema)
+    cls.check_schema(schema)
+    validator = cls(schema)
+    _VALIDATOR_CACHE[id(schema)] = (schema, validator)
+    return validator
 
 
 def load_config(path: str) -> Dict[str, Any]:
@@ -364,7 +490,7 @@ def load_config(path: str) -> Dict[str, Any]:
     """
 
     config_path = Path(path).expanduser().resolve()
-    config = _load_json(config_path)
+    config = _load_json_cached(config_path)
 
     if jsonschema is None:
         print(
@@ -400,11 +526,12 @@ def load_config(path: str) -> Dict[str, Any]:
     if schema_path is None:
         raise FileNotFoundError("config.schema.json not found")
 
-    schema = _load_json(schema_path)
-    try:
-        jsonschema.validate(config, schema)
-    except jsonschema.ValidationError as exc:
-        raise ValueError(f"Config validation failed: {exc.message}") from exc
+    schema = _load_json_cached(schema_path)
+    # best_match picks the most relevant error, as jsonschema.validate() does;
+    # Validator.validate() would raise the first one iter_errors yields.
+    error = jsonschema.exceptions.best_match(_get_validator(schema).iter_errors(config))
+    if error is not None:
+        raise ValueError(f"Config validation failed: {error.message}") from error
 
     return config
 
@@ -451,40 +578,53 @@ def list_modules(config: Dict[str, Any]) -> None:
     print("\n✓ = installed by default when no --module specified")
 
 
-def load_installed_status(ctx: Dict[str, Any]) -> Dict[str, Any]:
-    """Load installed modules status from status file."""
+def load_installed_status(ctx: Dict[str, Any], cached: bool = False) -> Dict[str, Any]:
+    """Load installed modules status from status file.
+
+    With cached=True the parsed file is shared between calls and must be
+    treated as read-only.
+    """
     status_path = Path(ctx["status_file"])
     if status_path.exists():
         try:
-            return _load_json(status_path)
+            return (_load_json_cached if cached else _load_json)(status_path)
         except (ValueError, FileNotFoundError):
             return {"modules": {}}
     return {"modules": {}}
 
 
-def check_module_installed(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> bool:
-    """Check if a module is installed by verifying its files exist."""
+def check_module_installed(
+    name: str, cfg: Dict[str, Any], ctx: Dict[str, Any], top_level: Optional[Set[str]] = None
+) -> bool:
+    """Check if a module is installed by verifying its files exist.
+
+    ``top_level`` optionally holds the entry names of install_dir, letting
+    copy targets under a missing top-level entry be skipped without a stat.
+    """
     install_dir = ctx["install_dir"]
 
     for op in cfg.get("operations", []):
         op_type = op.get("type")
         if op_type in ("copy_dir", "copy_file"):
-            target = (install_dir / op["target"]).expanduser().resolve()
-            if target.exists():
+            head = op["target"].split("/", 1)[0]
+            if top_level is not None and head not in top_level and head not in ("", ".", ".."):
+                continue
+            if (install_dir / op["target"]).exists():
                 return True
         elif op_type == "merge_dir":
-            src = (ctx["config_dir"] / op["source"]).expanduser().resolve()
-            if not src.exists() or not src.is_dir():
+            src = ctx["config_dir"] / op["source"]
+            try:
+                with os.scandir(src) as subdirs:
+                    for subdir in subdirs:
+                        if not subdir.is_dir():
+                            continue
+                        dst_dir = os.path.join(install_dir, subdir.name)
+                        with os.scandir(subdir.path) as files:
+                            for f in files:
+                                if f.is_file() and os.path.exists(os.path.join(dst_dir, f.name)):
+                                    return True
+            except OSError:
                 continue
-            for subdir in src.iterdir():
-                if not subdir.is_dir():
-                    continue
-                for f in subdir.iterdir():
-                    if not f.is_file():
-                        continue
-                    candidate = (install_dir / subdir.name / f.name).expanduser().resolve()
-                    if candidate.exists():
-                        return True
     return False
 
 
@@ -494,14 +634,20 @@ def get_installed_modules(config: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[s
     modules = config.get("modules", {})
 
     # First check status file
-    status = load_installed_status(ctx)
+    status = load_installed_status(ctx, cached=True)
     status_modules = status.get("modules", {})
 
+    top_level: Optional[Set[str]] = None
+    if not status_modules.keys() >= modules.keys():
+        try:
+            with os.scandir(ctx["install_dir"]) as it:
+                top_level = {entry.name for entry in it}
+        except OSError:
+            pass
+
     for name, cfg in modules.items():
-        # Check both status file and filesystem
-        in_status = name in status_modules
-        files_exist = check_module_installed(name, cfg, ctx)
-        result[name] = in_status or files_exist
+        # Trust the status file first; only fall back to the filesystem
+        result[name] = name in status_modules or check_module_installed(name, cfg, ctx, top_level)
 
     return result
 
@@ -509,14 +655,17 @@ def get_installed_modules(config: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[s
 def list_modules_with_status(config: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     """List modules with installation status."""
     installed_status = get_installed_modules(config, ctx)
-    status_data = load_installed_status(ctx)
+    status_data = load_installed_status(ctx, cached=True)
     status_modules = status_data.get("modules", {})
 
-    print("\n" + "=" * 70)
-    print("Module Status")
-    print("=" * 70)
-    print(f"{'#':<3} {'Name':<15} {'Status':<15} {'Installed At':<20} Description")
-    print("-" * 70)
+    lines = [
+        "",
+        "=" * 70,
+        "Module Status",
+        "=" * 70,
+        f"{'#':<3} {'Name':<15} {'Status':<15} {'Installed At':<20} Description",
+        "-" * 70,
+    ]
 
     for idx, (name, cfg) in enumerate(config.get("modules", {}).items(), 1):
         desc = cfg.get("description", "")[:25]
@@ -526,12 +675,14 @@ def list_modules_with_status(config: Dict[str, Any], ctx: Dict[str, Any]) -> Non
         else:
             status = "⬚ Not installed"
             installed_at = ""
-        print(f"{idx:<3} {name:<15} {status:<15} {installed_at:<20} {desc}")
+        lines.append(f"{idx:<3} {name:<15} {status:<15} {installed_at:<20} {desc}")
 
     total = len(config.get("modules", {}))
     installed_count = sum(1 for v in installed_status.values() if v)
-    print(f"\nTotal: {installed_count}/{total} modules installed")
-    print(f"Install dir: {ctx['install_dir']}")
+    lines.append(f"\nTotal: {installed_count}/{total} modules installed")
+    lines.append(f"Install dir: {ctx['install_dir']}")
+    # One write per table instead of one print() per row
+    print("\n".join(lines))
 
 
 def select_modules(config: Dict[str, Any], module_arg: Optional[str]) -> Dict[str, Any]:
@@ -623,6 +774,14 @@ def interactive_select_modules(config: Dict[str, Any]) -> Dict[str, Any]:
             continue
 
 
+def _queue_parents(target: Path, install_dir: Path, pending: Set[Path]) -> None:
+    """Add target's ancestors below install_dir to the pending cleanup set."""
+    parent = target.parent
+    while parent != install_dir and parent not in pending and parent != parent.parent:
+        pending.add(parent)
+        parent = parent.parent
+
+
 def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[str, Any]:
     """Uninstall a module by removing its files and hooks."""
     result: Dict[str, Any] = {
@@ -633,17 +792,20 @@ def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dic
 
     install_dir = ctx["install_dir"]
     removed_paths = []
-    status = load_installed_status(ctx)
+    status = load_installed_status(ctx, cached=True)
     module_status = status.get("modules", {}).get(name, {})
     merge_dir_files = module_status.get("merge_dir_files", [])
     if not isinstance(merge_dir_files, list):
         merge_dir_files = []
+    # merge_dir files share a handful of parent dirs; resolve each parent once.
+    resolved_parents: Dict[Path, Path] = {}
+    pending_parents: Set[Path] = set()
 
     for op in cfg.get("operations", []):
         op_type = op.get("type")
         try:
             if op_type in ("copy_dir", "copy_file"):
-                target = (install_dir / op["target"]).expanduser().resolve()
+                target = (install_dir / op["target"]).resolve()
                 if target.exists():
                     if target.is_dir():
                         shutil.rmtree(target)
@@ -651,14 +813,7 @@ def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dic
                         target.unlink()
                     removed_paths.append(str(target))
                     write_log({"level": "INFO", "message": f"Removed: {target}"}, ctx)
-                    # Clean up empty parent directories up to install_dir
-                    parent = target.parent
-                    while parent != install_dir and parent.exists():
-                        try:
-                            parent.rmdir()
-                        except OSError:
-                            break
-                        parent = parent.parent
+                    _queue_parents(target, install_dir, pending_parents)
             elif op_type == "merge_dir":
                 if not merge_dir_files:
                     write_log(
@@ -682,7 +837,11 @@ def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dic
                         )
                         continue
 
-                    target = (install_dir / rel_path).resolve()
+                    real_parent = resolved_parents.get(rel_path.parent)
+                    if real_parent is None:
+                        real_parent = (install_dir / rel_path.parent).resolve()
+                        resolved_parents[rel_path.parent] = real_parent
+                    target = real_parent / rel_path.name
                     if target == install_dir or install_dir not in target.parents:
                         write_log(
                             {
@@ -701,16 +860,19 @@ def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dic
                         removed_paths.append(str(target))
                         write_log({"level": "INFO", "message": f"Removed: {target}"}, ctx)
 
-                    parent = target.parent
-                    while parent != install_dir and parent.exists():
-                        try:
-                            parent.rmdir()
-                        except OSError:
-                            break
-                        parent = parent.parent
+                    _queue_parents(target, install_dir, pending_parents)
         except Exception as exc:
             write_log({"level": "WARNING", "message": f"Failed to remove {op.get('target', 'unknown')}: {exc}"}, ctx)
 
+    # Clean up empty parent directories up to install_dir, deepest first
+    for parent in sorted(pending_parents, key=lambda p: len(p.parts), reverse=True):
+        try:
+            parent.rmdir()
+        except OSError:
+            pass
+
+    _DIRS_CREATED.clear()
+
     # Remove module hooks from settings.json
     try:
         unmerge_hooks_from_settings(name, ctx)
@@ -726,6 +888,7 @@ def uninstall_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dic
         write_log({"level": "WARNING", "message": f"Failed to remove agents for {name}: {exc}"}, ctx)
 
     result["removed_paths"] = removed_paths
+    flush_log(ctx)
     return result
 
 
@@ -741,9 +904,7 @@ def update_status_after_uninstall(uninstalled_modules: List[str], ctx: Dict[str,
     status["modules"] = modules
     status["updated_at"] = datetime.now().isoformat()
 
-    status_path = Path(ctx["status_file"])
-    with status_path.open("w", encoding="utf-8") as fh:
-        json.dump(status, fh, indent=2, ensure_ascii=False)
+    _save_json(Path(ctx["status_file"]), status)
 
 
 def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
@@ -755,11 +916,14 @@ def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
         modules = config.get("modules", {})
         module_names = list(modules.keys())
 
-        print("\n" + "=" * 70)
-        print("Claude Plugin Manager")
-        print("=" * 70)
-        print(f"{'#':<3} {'Name':<15} {'Status':<15} Description")
-        print("-" * 70)
+        lines = [
+            "",
+            "=" * 70,
+            "Claude Plugin Manager",
+            "=" * 70,
+            f"{'#':<3} {'Name':<15} {'Status':<15} Description",
+            "-" * 70,
+        ]
 
         for idx, (name, cfg) in enumerate(modules.items(), 1):
             desc = cfg.get("description", "")[:30]
@@ -767,17 +931,20 @@ def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
                 status = "✅ Installed"
             else:
                 status = "⬚ Not installed"
-            print(f"{idx:<3} {name:<15} {status:<15} {desc}")
+            lines.append(f"{idx:<3} {name:<15} {status:<15} {desc}")
 
         total = len(modules)
         installed_count = sum(1 for v in installed_status.values() if v)
-        print(f"\nInstalled: {installed_count}/{total} | Dir: {ctx['install_dir']}")
-
-        print("\nCommands:")
-        print("  i <num/name>  - Install module(s)")
-        print("  u <num/name>  - Uninstall module(s)")
-        print("  q             - Quit")
-        print()
+        lines += [
+            f"\nInstalled: {installed_count}/{total} | Dir: {ctx['install_dir']}",
+            "\nCommands:",
+            "  i <num/name>  - Install module(s)",
+            "  u <num/name>  - Uninstall module(s)",
+            "  q             - Quit",
+            "",
+        ]
+        # Redraw the menu with a single write
+        print("\n".join(lines))
 
         try:
             user_input = input("Enter command: ").strip()
@@ -813,6 +980,7 @@ def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
                         print(f"  ✓ {name} installed")
                     except Exception as exc:
                         print(f"  ✗ {name} failed: {exc}")
+                flush_settings(ctx)
                 # Update status
                 current_status = load_installed_status(ctx)
                 for r in results:
@@ -820,8 +988,7 @@ def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
                         current_status.setdefault("modules", {})[r["module"]] = r
                         ctx["_did_install"] = True
                 current_status["updated_at"] = datetime.now().isoformat()
-                with Path(ctx["status_file"]).open("w", encoding="utf-8") as fh:
-                    json.dump(current_status, fh, indent=2, ensure_ascii=False)
+                _save_json(Path(ctx["status_file"]), current_status)
 
         elif cmd == "u":
             # Uninstall
@@ -843,6 +1010,7 @@ def interactive_manage(config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
                         print(f"  ✓ {name} uninstalled")
                     except Exception as exc:
                         print(f"  ✗ {name} failed: {exc}")
+                flush_settings(ctx)
                 update_status_after_uninstall(list(to_uninstall.keys()), ctx)
 
         else:
@@ -930,6 +1098,8 @@ def execute_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[
                 ctx,
             )
             raise
+        finally:
+            flush_log(ctx)
 
     # Handle hooks: find and merge module hooks into settings.json
     hooks_results = find_module_hooks(name, cfg, ctx)
@@ -954,19 +1124,22 @@ def execute_module(name: str, cfg: Dict[str, Any], ctx: Dict[str, Any]) -> Dict[
             write_log({"level": "WARNING", "message": f"Failed to merge agents for {name}: {exc}"}, ctx)
             result["operations"].append({"type": "merge_agents", "status": "failed", "error": str(exc)})
 
+    flush_log(ctx)
     return result
 
 
+# config_dir and install_dir are resolved once in resolve_paths; op paths are
+# only resolved where containment matters (_record_created, rollback).
 def _source_path(op: Dict[str, Any], ctx: Dict[str, Any]) -> Path:
-    return (ctx["config_dir"] / op["source"]).expanduser().resolve()
+    return ctx["config_dir"] / op["source"]
 
 
 def _target_path(op: Dict[str, Any], ctx: Dict[str, Any]) -> Path:
-    return (ctx["install_dir"] / op["target"]).expanduser().resolve()
+    return ctx["install_dir"] / op["target"]
 
 
 def _record_created(path: Path, ctx: Dict[str, Any]) -> None:
-    install_dir = Path(ctx["install_dir"]).resolve()
+    install_dir = ctx["install_dir"]  # already resolved by resolve_paths
     resolved = Path(path).resolve()
     if resolved == install_dir or install_dir not in resolved.parents:
         return
@@ -975,6 +1148,64 @@ def _record_created(path: Path, ctx: Dict[str, Any]) -> None:
         applied.append(resolved)
 
 
+def _files_identical(src: Union[str, Path], dst: Union[str, Path]) -> bool:
+    try:
+        a = os.stat(src)
+        b = os.stat(dst)
+    except OSError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
+
+
+def _copy_file(src: Union[str, Path], dst: Union[str, Path]) -> None:
+    """Copy like shutil.copy2, letting the kernel move (or reflink) the data.
+
+    Uses os.copy_file_range where available and falls back to shutil.copy2
+    on any OSError (cross-device, unsupported filesystem, old kernel, ...).
+    A dst that already matches src in size and mtime (as copy2 leaves it) is
+    left alone, so forced re-installs only rewrite changed files.
+    """
+    if _files_identical(src, dst):
+        return
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None and not (os.path.exists(dst) and os.path.samefile(src, dst)):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            # Some filesystems (FUSE, procfs-like files, some cross-fs pairs)
+            # report 0 instead of failing; a short copy falls back to copy2.
+            if remaining == 0:
+                shutil.copystat(src, dst)
+                return
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+
+
+def _copy_files(pairs: List[tuple]) -> None:
+    """Copy (src, dst) file pairs, spreading large batches over a thread pool.
+
+    Per-file copies are dominated by open/stat/close syscalls that release the
+    GIL, so a handful of threads overlap them well. Small batches are copied
+    inline to avoid the pool start-up cost.
+    """
+    if len(pairs) < _PARALLEL_COPY_MIN:
+        for src, dst in pairs:
+            _copy_file(src, dst)
+        return
+    from concurrent.futures import ThreadPoolExecutor
+
+    workers = min(_PARALLEL_COPY_WORKERS, len(pairs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        # list() re-raises the first copy error, as the serial loop would
+        list(pool.map(lambda pair: _copy_file(*pair), pairs))
+
+
 def op_copy_dir(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     src = _source_path(op, ctx)
     dst = _target_path(op, ctx)
@@ -984,8 +1215,8 @@ def op_copy_dir(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
         write_log({"level": "INFO", "message": f"Skip existing dir: {dst}"}, ctx)
         return
 
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copytree(src, dst, dirs_exist_ok=True)
+    _ensure_dir(dst.parent)
+    shutil.copytree(src, dst, dirs_exist_ok=True, copy_function=_copy_file)
     if not existed_before:
         _record_created(dst, ctx)
     write_log({"level": "INFO", "message": f"Copied dir {src} -> {dst}"}, ctx)
@@ -997,20 +1228,25 @@ def op_merge_dir(op: Dict[str, Any], ctx: Dict[str, Any]) -> List[str]:
     install_dir = ctx["install_dir"]
     force = ctx.get("force", False)
     merged = []
+    pairs = []
 
-    for subdir in src.iterdir():
-        if not subdir.is_dir():
-            continue
-        target_subdir = install_dir / subdir.name
-        target_subdir.mkdir(parents=True, exist_ok=True)
-        for f in subdir.iterdir():
-            if f.is_file():
-                dst = target_subdir / f.name
-                if dst.exists() and not force:
-                    continue
-                shutil.copy2(f, dst)
-                merged.append(f"{subdir.name}/{f.name}")
-
+    # DirEntry.is_dir()/is_file() come from readdir, saving a stat per entry
+    with os.scandir(src) as subdirs:
+        for subdir in subdirs:
+            if not subdir.is_dir():
+                continue
+            target_subdir = install_dir / subdir.name
+            _ensure_dir(target_subdir)
+            with os.scandir(subdir.path) as files:
+                for f in files:
+                    if f.is_file():
+                        dst = os.path.join(target_subdir, f.name)
+                        if not force and os.path.exists(dst):
+                            continue
+                        pairs.append((f.path, dst))
+                        merged.append(f"{subdir.name}/{f.name}")
+
+    _copy_files(pairs)
     write_log({"level": "INFO", "message": f"Merged {src.name}: {', '.join(merged) or 'no files'}"}, ctx)
     return merged
 
@@ -1024,8 +1260,8 @@ def op_copy_file(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
         write_log({"level": "INFO", "message": f"Skip existing file: {dst}"}, ctx)
         return
 
-    dst.parent.mkdir(parents=True, exist_ok=True)
-    shutil.copy2(src, dst)
+    _ensure_dir(dst.parent)
+    _copy_file(src, dst)
     if not existed_before:
         _record_created(dst, ctx)
     write_log({"level": "INFO", "message": f"Copied file {src} -> {dst}"}, ctx)
@@ -1040,9 +1276,17 @@ def op_merge_json(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     if not src.exists():
         raise FileNotFoundError(f"Source JSON not found: {src}")
 
-    src_data = _load_json(src)
+    # Only read from, never mutated: share the cached parse
+    src_data = _load_json_cached(src)
 
-    dst.parent.mkdir(parents=True, exist_ok=True)
+    # Resolved, so targets like "x/../settings.json" or a symlink still match
+    if dst.resolve() == (ctx["install_dir"] / SETTINGS_FILE).resolve():
+        # Hook merges stage settings.json in ctx: write pending changes first
+        # and make the next load_settings() see this merge.
+        flush_settings(ctx)
+        ctx.pop("_settings_cache", None)
+
+    _ensure_dir(dst.parent)
     if dst.exists():
         dst_data = _load_json(dst)
     else:
@@ -1058,28 +1302,34 @@ def op_merge_json(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
 
         last_key = keys[-1]
         if isinstance(src_data, dict) and isinstance(target.get(last_key), dict):
-            # Deep merge for dicts
-            target[last_key] = {**target.get(last_key, {}), **src_data}
+            # Deep merge for dicts (dst_data is a fresh parse, update in place)
+            target[last_key].update(src_data)
         else:
             target[last_key] = src_data
     else:
         # Merge at root level
         if isinstance(src_data, dict) and isinstance(dst_data, dict):
-            dst_data = {**dst_data, **src_data}
+            dst_data.update(src_data)
         else:
             dst_data = src_data
 
-    with dst.open("w", encoding="utf-8") as fh:
-        json.dump(dst_data, fh, indent=2, ensure_ascii=False)
-        fh.write("\n")
+    _save_json(dst, dst_data)
 
     write_log({"level": "INFO", "message": f"Merged JSON {src} -> {dst} (key: {merge_key or 'root'})"}, ctx)
 
 
 def op_run_command(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
-    env = os.environ.copy()
-    for key, value in op.get("env", {}).items():
-        env[key] = value.replace("${install_dir}", str(ctx["install_dir"]))
+    # Imported here so --status/--list-modules runs skip it
+    import subprocess
+
+    # None inherits os.environ as-is; only copy it when the op adds variables
+    env: Optional[Dict[str, str]] = None
+    op_env = op.get("env")
+    if op_env:
+        install_dir = str(ctx["install_dir"])
+        env = os.environ.copy()
+        for key, value in op_env.items():
+            env[key] = value.replace("${install_dir}", install_dir)
 
     command = op.get("command", "")
     if sys.platform == "win32" and command.strip() == "bash install.sh":
@@ -1093,7 +1343,8 @@ def op_run_command(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
         env=env,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
+        # The Unix branch below reads raw bytes straight from the pipe fds
+        text=sys.platform == "win32",
     )
 
     stdout_lines: List[str] = []
@@ -1120,26 +1371,36 @@ def op_run_command(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
         stderr_thread.join()
         process.wait()
     else:
-        # On Unix, use selectors for more efficient I/O
+        # On Unix, use selectors for more efficient I/O. Read whatever is
+        # available with os.read: a buffered readline() would block on a
+        # partial line while the command stalls writing to the other pipe.
+        import codecs
         import selectors
+
+        streams = {
+            process.stdout.fileno(): (stdout_lines, sys.stdout),  # type: ignore[union-attr]
+            process.stderr.fileno(): (stderr_lines, sys.stderr),  # type: ignore[union-attr]
+        }
+        decoders = {fd: codecs.getincrementaldecoder("utf-8")("replace") for fd in streams}
         sel = selectors.DefaultSelector()
-        sel.register(process.stdout, selectors.EVENT_READ)  # type: ignore[arg-type]
-        sel.register(process.stderr, selectors.EVENT_READ)  # type: ignore[arg-type]
-
-        while process.poll() is None or sel.get_map():
-            for key, _ in sel.select(timeout=0.1):
-                line = key.fileobj.readline()  # type: ignore[union-attr]
-                if not line:
-                    sel.unregister(key.fileobj)
-                    continue
-                if key.fileobj == process.stdout:
-                    stdout_lines.append(line)
-                    print(line, end="", flush=True)
-                else:
-                    stderr_lines.append(line)
-                    print(line, end="", file=sys.stderr, flush=True)
+        for fd in streams:
+            sel.register(fd, selectors.EVENT_READ)
+
+        # Block until output arrives; both pipes hit EOF when the command exits
+        while sel.get_map():
+            for key, _ in sel.select():
+                chunk = os.read(key.fd, 65536)
+                text = decoders[key.fd].decode(chunk, final=not chunk)
+                lines, out = streams[key.fd]
+                if text:
+                    lines.append(text)
+                    print(text, end="", file=out, flush=True)
+                if not chunk:
+                    sel.unregister(key.fd)
 
         sel.close()
+        process.stdout.close()  # type: ignore[union-attr]
+        process.stderr.close()  # type: ignore[union-attr]
         process.wait()
 
     write_log(
@@ -1157,19 +1418,45 @@ def op_run_command(op: Dict[str, Any], ctx: Dict[str, Any]) -> None:
         raise RuntimeError(f"Command failed with code {process.returncode}: {command}")
 
 
-def write_log(entry: Dict[str, Any], ctx: Dict[str, Any]) -> None:
-    log_path = Path(ctx["log_file"])
-    log_path.parent.mkdir(parents=True, exist_ok=True)
+def _log_handle(ctx: Dict[str, Any]) -> Any:
+    """Return the run's append handle for the log file, opening it once.
+
+    Writes are buffered; flush_log() runs after each operation and
+    close_log() at the end of main().
+    """
+    fh = ctx.get("_log_fh")
+    if fh is None or fh.closed:
+        log_path = Path(ctx["log_file"])
+        _ensure_dir(log_path.parent)
+        fh = log_path.open("a", encoding="utf-8", buffering=1 << 16)
+        ctx["_log_fh"] = fh
+    return fh
+
 
+def flush_log(ctx: Dict[str, Any]) -> None:
+    """Write buffered log entries to disk, if the log is open."""
+    fh = ctx.get("_log_fh")
+    if fh is not None and not fh.closed:
+        fh.flush()
+
+
+def close_log(ctx: Dict[str, Any]) -> None:
+    """Flush and close the run's log handle, if one was opened."""
+    fh = ctx.pop("_log_fh", None)
+    if fh is not None:
+        fh.close()
+
+
+def write_log(entry: Dict[str, Any], ctx: Dict[str, Any]) -> None:
     ts = datetime.now().isoformat()
     level = entry.get("level", "INFO")
     message = entry.get("message", "")
 
-    with log_path.open("a", encoding="utf-8") as fh:
-        fh.write(f"[{ts}] {level}: {message}\n")
-        for key in ("stdout", "stderr", "returncode"):
-            if key in entry and entry[key] not in (None, ""):
-                fh.write(f"  {key}: {entry[key]}\n")
+    lines = [f"[{ts}] {level}: {message}\n"]
+    for key in ("stdout", "stderr", "returncode"):
+        if key in entry and entry[key] not in (None, ""):
+            lines.append(f"  {key}: {entry[key]}\n")
+    _log_handle(ctx).write("".join(lines))
 
     # Terminal output when verbose
     if ctx.get("verbose"):
@@ -1189,10 +1476,7 @@ def write_status(results: List[Dict[str, Any]], ctx: Dict[str, Any]) -> None:
         "modules": {item["module"]: item for item in results},
     }
 
-    status_path = Path(ctx["status_file"])
-    status_path.parent.mkdir(parents=True, exist_ok=True)
-    with status_path.open("w", encoding="utf-8") as fh:
-        json.dump(status, fh, indent=2, ensure_ascii=False)
+    _save_json(Path(ctx["status_file"]), status)
 
 
 def install_default_configs(ctx: Dict[str, Any]) -> None:
@@ -1205,15 +1489,45 @@ def install_default_configs(ctx: Dict[str, Any]) -> None:
         claude_md_src = config_dir / "memorys" / "CLAUDE.md"
         claude_md_dst = install_dir / "CLAUDE.md"
         if not claude_md_dst.exists() and claude_md_src.exists():
-            shutil.copy2(claude_md_src, claude_md_dst)
+            _copy_file(claude_md_src, claude_md_dst)
             print(f"  Installed CLAUDE.md to {claude_md_dst}")
             write_log({"level": "INFO", "message": f"Installed CLAUDE.md to {claude_md_dst}"}, ctx)
     except Exception as exc:
         print(f"  Warning: could not install default configs: {exc}", file=sys.stderr)
 
 
+def _which_many(names: Iterable[str]) -> Set[str]:
+    """Return the subset of names found as executables on PATH.
+
+    Lists each PATH directory once instead of probing it per name, as a
+    shutil.which() loop would. Windows (PATHEXT lookups) keeps shutil.which.
+    """
+    if sys.platform == "win32":
+        return {name for name in names if shutil.which(name)}
+    wanted = set(names)
+    found: Set[str] = set()
+    for directory in dict.fromkeys(os.environ.get("PATH", os.defpath).split(os.pathsep)):
+        try:
+            with os.scandir(directory or os.curdir) as it:
+                for entry in it:
+                    if (
+                        entry.name in wanted
+                        and not entry.is_dir()
+                        and os.access(entry.path, os.X_OK)
+                    ):
+                        found.add(entry.name)
+                        wanted.discard(entry.name)
+        except OSError:
+            continue
+        if not wanted:
+            break
+    return found
+
+
 def print_post_install_info(ctx: Dict[str, Any]) -> None:
     """Print post-install verification and setup guidance."""
+    import subprocess
+
     install_dir = ctx["install_dir"]
 
     # Check codeagent-wrapper version
@@ -1232,15 +1546,20 @@ def print_post_install_info(ctx: Dict[str, Any]) -> None:
     # Check PATH
     bin_dir = str(install_dir / "bin")
     env_path = os.environ.get("PATH", "")
-    path_ok = any(
-        os.path.realpath(p) == os.path.realpath(bin_dir)
-        if os.path.exists(p) else p == bin_dir
-        for p in env_path.split(os.pathsep)
-    )
+    path_entries = env_path.split(os.pathsep)
+    # An exact entry needs no syscalls; otherwise compare resolved paths
+    path_ok = bin_dir in path_entries
+    if not path_ok:
+        real_bin_dir = os.path.realpath(bin_dir)
+        path_ok = any(
+            os.path.exists(p) and os.path.realpath(p) == real_bin_dir
+            for p in path_entries
+        )
 
     # Check backend CLIs
     backends = ["codex", "claude", "gemini", "opencode"]
-    detected = {name: shutil.which(name) is not None for name in backends}
+    found = _which_many(backends)
+    detected = {name: name in found for name in backends}
 
     print("\nSetup Complete!")
     v_mark = "✓" if wrapper_version else "✗"
@@ -1260,15 +1579,21 @@ def prepare_status_backup(ctx: Dict[str, Any]) -> None:
     status_path = Path(ctx["status_file"])
     if status_path.exists():
         backup = status_path.with_suffix(".json.bak")
-        backup.parent.mkdir(parents=True, exist_ok=True)
-        shutil.copy2(status_path, backup)
+        _ensure_dir(backup.parent)
+        # _save_json replaces the status file with a new inode, so a hard
+        # link is a stable snapshot that costs no data copy
+        try:
+            backup.unlink(missing_ok=True)
+            os.link(status_path, backup)
+        except OSError:
+            _copy_file(status_path, backup)
         ctx["status_backup"] = backup
 
 
 def rollback(ctx: Dict[str, Any]) -> None:
     write_log({"level": "WARNING", "message": "Rolling back installation"}, ctx)
 
-    install_dir = Path(ctx["install_dir"]).resolve()
+    install_dir = ctx["install_dir"]  # already resolved by resolve_paths
     for path in reversed(ctx.get("applied_paths", [])):
         resolved = Path(path).resolve()
         try:
@@ -1287,11 +1612,17 @@ def rollback(ctx: Dict[str, Any]) -> None:
                 ctx,
             )
 
+    _DIRS_CREATED.clear()
+    # Hooks/agents merged by modules that completed before the failure stay
+    flush_settings(ctx)
+
     backup = ctx.get("status_backup")
     if backup and Path(backup).exists():
-        shutil.copy2(backup, ctx["status_file"])
+        # May still be the same inode as the status file (hard-linked backup)
+        _copy_file(backup, ctx["status_file"])
 
     write_log({"level": "INFO", "message": "Rollback completed"}, ctx)
+    flush_log(ctx)
 
 
 def main(argv: Optional[Iterable[str]] = None) -> int:
@@ -1303,7 +1634,14 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
         return 1
 
     ctx = resolve_paths(config, args)
+    try:
+        return _run(args, config, ctx)
+    finally:
+        close_log(ctx)
+
 
+def _run(args: argparse.Namespace, config: Dict[str, Any], ctx: Dict[str, Any]) -> int:
+    """Dispatch the parsed command line; main() closes the log afterwards."""
     # Handle --list-modules
     if getattr(args, "list_modules", False):
         list_modules(config)
@@ -1320,7 +1658,7 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             print("Error: --uninstall requires --module to specify which modules to uninstall")
             return 1
         modules = config.get("modules", {})
-        installed = load_installed_status(ctx)
+        installed = load_installed_status(ctx, cached=True)
         installed_modules = installed.get("modules", {})
 
         selected = select_modules(config, args.module)
@@ -1338,6 +1676,7 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             except Exception as exc:
                 print(f"  ✗ {name} failed: {exc}", file=sys.stderr)
 
+        flush_settings(ctx)
         update_status_after_uninstall(list(to_uninstall.keys()), ctx)
         print(f"\n✓ Uninstall complete")
         return 0
@@ -1392,13 +1731,13 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
                 )
                 break
 
+        flush_settings(ctx)
         current_status = load_installed_status(ctx)
         for r in results:
             if r.get("status") == "success":
                 current_status.setdefault("modules", {})[r["module"]] = r
         current_status["updated_at"] = datetime.now().isoformat()
-        with Path(ctx["status_file"]).open("w", encoding="utf-8") as fh:
-            json.dump(current_status, fh, indent=2, ensure_ascii=False)
+        _save_json(Path(ctx["status_file"]), current_status)
 
         success = sum(1 for r in results if r.get("status") == "success")
         failed = len(results) - success
@@ -1461,14 +1800,15 @@ def main(argv: Optional[Iterable[str]] = None) -> int:
             )
             break
 
+    flush_settings(ctx)
+
     # Merge with existing status
     current_status = load_installed_status(ctx)
     for r in results:
         if r.get("status") == "success":
             current_status.setdefault("modules", {})[r["module"]] = r
     current_status["updated_at"] = datetime.now().isoformat()
-    with Path(ctx["status_file"]).open("w", encoding="utf-8") as fh:
-        json.dump(current_status, fh, indent=2, ensure_ascii=False)
+    _save_json(Path(ctx["status_file"]), current_status)
 
     # Summary
     success = sum(1 for r in results if r.get("status") == "success")
@@ -9,12 +9,12 @@ Uses the new task directory structure under .claude/do-tasks/.
 import glob
 import json
 import os
-import re
 import sys
 
 DIR_TASKS = ".claude/do-tasks"
 FILE_CURRENT_TASK = ".current-task"
 FILE_TASK_MD = "task.md"
+FRONTMATTER_READ_SIZE = 8192
 
 PHASE_NAMES = {
     1: "Understand",
@@ -49,19 +49,25 @@ def get_task_info(project_dir: str, task_dir: str) -> dict | None:
         return None
     try:
         with open(task_md_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            # The frontmatter sits at the top; only read the body if needed
+            content = f.read(FRONTMATTER_READ_SIZE)
+            if not content.startswith("---\n"):
+                return None
+            end = content.find("\n---\n", 4)
+            if end == -1:
+                content += f.read()
+                end = content.find("\n---\n", 4)
     except Exception:
         return None
 
-    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-    if not match:
+    if end == -1:
         return None
 
     frontmatter = {}
-    for line in match.group(1).split("\n"):
-        if ":" not in line:
+    for line in content[4:end].split("\n"):
+        key, sep, value = line.partition(":")
+        if not sep:
             continue
-        key, value = line.split(":", 1)
         key = key.strip()
         value = value.strip()
         if value.startswith('"') and value.endswith('"'):
@@ -70,7 +76,7 @@ def get_task_info(project_dir: str, task_dir: str) -> dict | None:
             value = True
         elif value == "false":
             value = False
-        elif value.isdigit():
+        elif value.isdecimal():
             value = int(value)
         frontmatter[key] = value
 
@@ -16,11 +16,11 @@ State file: .claude/do-tasks/.verify-state.json
 
 import json
 import os
-import re
+import signal
 import subprocess
 import sys
-from datetime import datetime
-from pathlib import Path
+import threading
+import time
 
 # Configuration
 MAX_ITERATIONS = 5
@@ -28,7 +28,9 @@ STATE_TIMEOUT_MINUTES = 30
 DIR_TASKS = ".claude/do-tasks"
 FILE_CURRENT_TASK = ".current-task"
 FILE_TASK_MD = "task.md"
+FRONTMATTER_READ_SIZE = 8192
 STATE_FILE = ".claude/do-tasks/.verify-state.json"
+OUTPUT_CAPTURE_LIMIT = 4096  # bytes kept per stream of a verify command
 
 # Only control loop for code-reviewer agent
 TARGET_AGENTS = {"code-reviewer"}
@@ -36,12 +38,14 @@ TARGET_AGENTS = {"code-reviewer"}
 
 def get_project_root(cwd: str) -> str | None:
     """Find project root (directory with .claude folder)."""
-    current = Path(cwd).resolve()
-    while current != current.parent:
-        if (current / ".claude").exists():
-            return str(current)
-        current = current.parent
-    return None
+    current = os.path.abspath(cwd)
+    while True:
+        parent = os.path.dirname(current)
+        if parent == current:
+            return None
+        if os.path.exists(os.path.join(current, ".claude")):
+            return current
+        current = parent
 
 
 def get_current_task(project_root: str) -> str | None:
@@ -64,19 +68,25 @@ def get_task_info(project_root: str, task_dir: str) -> dict | None:
         return None
     try:
         with open(task_md_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            # The frontmatter sits at the top; only read the body if needed
+            content = f.read(FRONTMATTER_READ_SIZE)
+            if not content.startswith("---\n"):
+                return None
+            end = content.find("\n---\n", 4)
+            if end == -1:
+                content += f.read()
+                end = content.find("\n---\n", 4)
     except Exception:
         return None
 
-    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-    if not match:
+    if end == -1:
         return None
 
     frontmatter = {}
-    for line in match.group(1).split("\n"):
-        if ":" not in line:
+    for line in content[4:end].split("\n"):
+        key, sep, value = line.partition(":")
+        if not sep:
             continue
-        key, value = line.split(":", 1)
         key = key.strip()
         value = value.strip()
         if value.startswith('"') and value.endswith('"'):
@@ -85,7 +95,7 @@ def get_task_info(project_root: str, task_dir: str) -> dict | None:
             value = True
         elif value == "false":
             value = False
-        elif value.isdigit():
+        elif value.isdecimal():
             value = int(value)
         frontmatter[key] = value
 
@@ -93,32 +103,103 @@ def get_task_info(project_root: str, task_dir: str) -> dict | None:
 
 
 def get_verify_commands(task_info: dict) -> list[str]:
-    """Get verify commands from task metadata."""
-    return task_info.get("verify_commands", [])
+    """Get verify commands from task metadata.
+
+    Frontmatter values are scalars, so a string is a single command, not a
+    list of characters to run.
+    """
+    commands = task_info.get("verify_commands", [])
+    if isinstance(commands, str):
+        return [commands] if commands.strip() else []
+    return commands if isinstance(commands, list) else []
+
 
+def _drain(pipe, head: bytearray) -> None:
+    """Read pipe to EOF, keeping only the first OUTPUT_CAPTURE_LIMIT bytes."""
+    with pipe:
+        for chunk in iter(lambda: pipe.read1(65536), b""):
+            if len(head) < OUTPUT_CAPTURE_LIMIT:
+                head += chunk[:OUTPUT_CAPTURE_LIMIT - len(head)]
 
-def run_verify_commands(project_root: str, commands: list[str]) -> tuple[bool, str]:
-    """Run verify commands and return (success, message)."""
-    for cmd in commands:
+
+def kill_process_group(proc: subprocess.Popen) -> None:
+    """Kill proc and everything it started (just proc where killpg is missing)."""
+    if hasattr(os, "killpg"):
         try:
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                cwd=project_root,
-                capture_output=True,
-                timeout=120,
-            )
-            if result.returncode != 0:
-                stderr = result.stderr.decode("utf-8", errors="replace")
-                stdout = result.stdout.decode("utf-8", errors="replace")
-                error_output = stderr or stdout
-                if len(error_output) > 500:
-                    error_output = error_output[:500] + "..."
-                return False, f"Command failed: {cmd}\n{error_output}"
-        except subprocess.TimeoutExpired:
-            return False, f"Command timed out: {cmd}"
-        except Exception as e:
-            return False, f"Command error: {cmd} - {str(e)}"
+            os.killpg(proc.pid, signal.SIGKILL)
+            return
+        except OSError:
+            pass
+    proc.kill()
+
+
+def run_verify_command(project_root: str, cmd: str) -> str | None:
+    """Run one verify command. Returns an error message, or None on success.
+
+    Output is drained but only its head is kept: the report shows at most
+    500 characters, so noisy test runners are not buffered in full.
+    """
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            shell=True,
+            cwd=project_root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            # Own process group, so a timeout also reaches the shell's children
+            start_new_session=True,
+        )
+    except Exception as e:
+        return f"Command error: {cmd} - {str(e)}"
+
+    stdout_head, stderr_head = bytearray(), bytearray()
+    readers = [
+        threading.Thread(target=_drain, args=(proc.stdout, stdout_head), daemon=True),
+        threading.Thread(target=_drain, args=(proc.stderr, stderr_head), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+    try:
+        returncode = proc.wait(timeout=120)
+    except subprocess.TimeoutExpired:
+        kill_process_group(proc)
+        proc.wait()
+        return f"Command timed out: {cmd}"
+    for reader in readers:
+        reader.join()
+
+    if returncode != 0:
+        stderr = stderr_head.decode("utf-8", errors="replace")
+        stdout = stdout_head.decode("utf-8", errors="replace")
+        error_output = stderr or stdout
+        if len(error_output) > 500:
+            error_output = error_output[:500] + "..."
+        return f"Command failed: {cmd}\n{error_output}"
+    return None
+
+
+def run_verify_commands(project_root: str, commands: list[str], parallel: bool = True) -> tuple[bool, str]:
+    """Run verify commands and return (success, message).
+
+    Commands run at the same time and the first failure in list order is
+    reported. With parallel=False (frontmatter `verify_sequential: true`)
+    they run one by one, stopping at the first failure.
+    """
+    if parallel and len(commands) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        workers = min(len(commands), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            errors = list(pool.map(lambda cmd: run_verify_command(project_root, cmd), commands))
+    else:
+        errors = []
+        for cmd in commands:
+            errors.append(run_verify_command(project_root, cmd))
+            if errors[-1]:
+                break
+    for error in errors:
+        if error:
+            return False, error
     return True, "All verify commands passed"
 
 
@@ -137,18 +218,28 @@ def load_state(project_root: str) -> dict:
 def save_state(project_root: str, state: dict) -> None:
     """Save verify loop state."""
     state_path = os.path.join(project_root, STATE_FILE)
+    tmp_path = state_path + ".tmp"
     try:
         os.makedirs(os.path.dirname(state_path), exist_ok=True)
-        with open(state_path, "w", encoding="utf-8") as f:
-            json.dump(state, f, indent=2, ensure_ascii=False)
+        # Compact, written in one go and renamed into place: a hook killed
+        # mid-write never leaves a truncated state file behind
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps(state, ensure_ascii=False, separators=(",", ":")))
+        os.replace(tmp_path, state_path)
     except Exception:
         pass
 
 
 def main():
+    raw = sys.stdin.buffer.read()
+    # Most events are for other hooks or agents: skip decoding them. Only a
+    # payload with \u escapes could spell the names differently.
+    if b"\\u" not in raw and not (b'"SubagentStop"' in raw and b"code-reviewer" in raw):
+        sys.exit(0)
+
     try:
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        input_data = json.loads(raw)
+    except (json.JSONDecodeError, UnicodeDecodeError):
         sys.exit(0)
 
     hook_event = input_data.get("hook_event_name", "")
@@ -183,30 +274,26 @@ def main():
     state = load_state(project_root)
 
     # Reset state if task changed or too old
+    now = int(time.time())
     should_reset = False
     if state.get("task") != task_dir:
         should_reset = True
     elif state.get("started_at"):
-        try:
-            started = datetime.fromisoformat(state["started_at"])
-            if (datetime.now() - started).total_seconds() > STATE_TIMEOUT_MINUTES * 60:
-                should_reset = True
-        except (ValueError, TypeError):
+        # Unix seconds; anything else (e.g. an older ISO string) starts over
+        started = state["started_at"]
+        if not isinstance(started, int) or now - started > STATE_TIMEOUT_MINUTES * 60:
             should_reset = True
 
     if should_reset:
         state = {
             "task": task_dir,
             "iteration": 0,
-            "started_at": datetime.now().isoformat(),
+            "started_at": now,
         }
 
-    # Increment iteration
-    state["iteration"] = state.get("iteration", 0) + 1
-    current_iteration = state["iteration"]
-    save_state(project_root, state)
+    current_iteration = state.get("iteration", 0) + 1
 
-    # Safety check: max iterations
+    # Safety check: max iterations (the counter goes straight back to 0)
     if current_iteration >= MAX_ITERATIONS:
         state["iteration"] = 0
         save_state(project_root, state)
@@ -217,8 +304,15 @@ def main():
         print(json.dumps(output, ensure_ascii=False))
         sys.exit(0)
 
+    # Persist the increment before running commands, so a hook killed while
+    # verifying still counts towards MAX_ITERATIONS
+    state["iteration"] = current_iteration
+    save_state(project_root, state)
+
     # Run verify commands
-    passed, message = run_verify_commands(project_root, verify_commands)
+    passed, message = run_verify_commands(
+        project_root, verify_commands, parallel=task_info.get("verify_sequential") is not True
+    )
 
     if passed:
         state["iteration"] = 0
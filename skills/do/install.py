@@ -74,11 +74,18 @@ def remove_hook(settings: dict) -> dict:
     stop_hooks = settings["hooks"]["Stop"]
     new_stop_hooks = []
 
+    def is_do_hook(h: dict) -> bool:
+        command = h.get("command", "")
+        return "stop-hook" in command and "do" in command
+
     for item in stop_hooks:
         if "hooks" in item:
-            filtered = [h for h in item["hooks"]
-                       if "stop-hook" not in h.get("command", "")
-                       or "do" not in h.get("command", "")]
+            hooks = item["hooks"]
+            # Leave other tools' entries untouched; only rebuild on a match
+            if hooks and not any(is_do_hook(h) for h in hooks):
+                new_stop_hooks.append(item)
+                continue
+            filtered = [h for h in hooks if not is_do_hook(h)]
             if filtered:
                 item["hooks"] = filtered
                 new_stop_hooks.append(item)
@@ -105,6 +112,41 @@ def install_models_json():
         json.dump(MODELS_JSON_TEMPLATE, f, indent=2)
     print(f"✓ Created {path}")
 
+def copy_file(src: str, dst: str):
+    """Copy file data in the kernel with os.sendfile, then copy metadata."""
+    try:
+        with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+            size = os.fstat(fsrc.fileno()).st_size
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(fdst.fileno(), fsrc.fileno(), offset, size - offset)
+                if not sent:
+                    break
+                offset += sent
+        complete = offset >= size
+    except (AttributeError, OSError):
+        # No os.sendfile (Windows) or no file-to-file support (macOS)
+        complete = False
+    if not complete:
+        # Also covers a sendfile that stopped early, which would truncate dst
+        shutil.copyfile(src, dst)
+    shutil.copystat(src, dst)
+
+def copy_tree(src: str, dst: Path):
+    """Copy a whole directory tree in one os.walk pass."""
+    copied_dirs = []
+    for root, dirs, files in os.walk(src, followlinks=True):
+        target_root = os.path.join(dst, os.path.relpath(root, src))
+        os.makedirs(target_root, exist_ok=True)
+        for name in files:
+            copy_file(os.path.join(root, name), os.path.join(target_root, name))
+        copied_dirs.append((root, target_root))
+    # Directory stats go on last and deepest first, as in shutil.copytree: a
+    # read-only mode would block creating children, and creating them would
+    # reset the copied mtimes.
+    for root, target_root in reversed(copied_dirs):
+        shutil.copystat(root, target_root)
+
 def install():
     src = Path(__file__).parent.resolve()
     dest = Path.home() / ".claude" / "skills" / SKILL_NAME
@@ -113,19 +155,25 @@ def install():
 
     exclude = {".git", "__pycache__", ".DS_Store", "install.py"}
 
-    for item in src.iterdir():
-        if item.name in exclude:
-            continue
-        target = dest / item.name
-        if target.exists():
-            if target.is_dir():
-                shutil.rmtree(target)
+    # One listing of dest instead of exists()/is_dir() stats per item
+    with os.scandir(dest) as it:
+        existing = {entry.name: entry for entry in it}
+
+    with os.scandir(src) as it:
+        for item in it:
+            if item.name in exclude:
+                continue
+            target = dest / item.name
+            old = existing.get(item.name)
+            if old is not None:
+                if old.is_dir():
+                    shutil.rmtree(target)
+                else:
+                    target.unlink()
+            if item.is_dir():
+                copy_tree(item.path, target)
             else:
-                target.unlink()
-        if item.is_dir():
-            shutil.copytree(item, target)
-        else:
-            shutil.copy2(item, target)
+                copy_file(item.path, target)
 
     settings = load_settings()
     settings = add_hook(settings)
@@ -8,13 +8,14 @@ Used by inject-context hook to build agent prompts.
 
 import json
 import os
-import re
 import sys
 from pathlib import Path
 
 DIR_TASKS = ".claude/do-tasks"
 FILE_CURRENT_TASK = ".current-task"
 FILE_TASK_MD = "task.md"
+FRONTMATTER_READ_SIZE = 8192
+MAX_FILE_CHARS = 512 * 1024  # per referenced file; longer files are truncated
 
 
 def get_project_root() -> str:
@@ -35,26 +36,26 @@ def get_current_task(project_root: str) -> str | None:
 
 def read_file_content(base_path: str, file_path: str) -> str | None:
     full_path = os.path.join(base_path, file_path)
-    if os.path.exists(full_path) and os.path.isfile(full_path):
-        try:
-            with open(full_path, "r", encoding="utf-8") as f:
-                return f.read()
-        except Exception:
-            return None
-    return None
+    # open() alone tells missing files and directories apart; no stat first
+    try:
+        with open(full_path, "r", encoding="utf-8") as f:
+            content = f.read(MAX_FILE_CHARS + 1)
+    except Exception:
+        return None
+    if len(content) > MAX_FILE_CHARS:
+        content = content[:MAX_FILE_CHARS] + "\n...[truncated]..."
+    return content
 
 
 def read_jsonl_entries(base_path: str, jsonl_path: str) -> list[tuple[str, str]]:
     full_path = os.path.join(base_path, jsonl_path)
-    if not os.path.exists(full_path):
-        return []
-
     results = []
     try:
-        with open(full_path, "r", encoding="utf-8") as f:
+        # json.loads takes UTF-8 bytes and ignores surrounding whitespace,
+        # so lines are parsed as read, without a text decode or strip()
+        with open(full_path, "rb") as f:
             for line in f:
-                line = line.strip()
-                if not line:
+                if line.isspace():
                     continue
                 try:
                     item = json.loads(line)
@@ -71,23 +72,22 @@ def read_jsonl_entries(base_path: str, jsonl_path: str) -> list[tuple[str, str]]
     return results
 
 
-def get_agent_context(project_root: str, task_dir: str, agent_type: str) -> str:
-    """Get complete context for specified agent."""
-    context_parts = []
-
+def iter_agent_context(project_root: str, task_dir: str, agent_type: str):
+    """Yield the context blocks for specified agent, in output order."""
     # Read agent-specific jsonl
     agent_jsonl = os.path.join(task_dir, f"{agent_type}.jsonl")
-    agent_entries = read_jsonl_entries(project_root, agent_jsonl)
-
-    for file_path, content in agent_entries:
-        context_parts.append(f"=== {file_path} ===\n{content}")
+    for file_path, content in read_jsonl_entries(project_root, agent_jsonl):
+        yield f"=== {file_path} ===\n{content}"
 
     # Read prd.md
     prd_content = read_file_content(project_root, os.path.join(task_dir, "prd.md"))
     if prd_content:
-        context_parts.append(f"=== {task_dir}/prd.md (Requirements) ===\n{prd_content}")
+        yield f"=== {task_dir}/prd.md (Requirements) ===\n{prd_content}"
 
-    return "\n\n".join(context_parts)
+
+def get_agent_context(project_root: str, task_dir: str, agent_type: str) -> str:
+    """Get complete context for specified agent."""
+    return "\n\n".join(iter_agent_context(project_root, task_dir, agent_type))
 
 
 def get_task_info(project_root: str, task_dir: str) -> dict | None:
@@ -97,19 +97,25 @@ def get_task_info(project_root: str, task_dir: str) -> dict | None:
         return None
     try:
         with open(task_md_path, "r", encoding="utf-8") as f:
-            content = f.read()
+            # The frontmatter sits at the top; only read the body if needed
+            content = f.read(FRONTMATTER_READ_SIZE)
+            if not content.startswith("---\n"):
+                return None
+            end = content.find("\n---\n", 4)
+            if end == -1:
+                content += f.read()
+                end = content.find("\n---\n", 4)
     except Exception:
         return None
 
-    match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-    if not match:
+    if end == -1:
         return None
 
     frontmatter = {}
-    for line in match.group(1).split("\n"):
-        if ":" not in line:
+    for line in content[4:end].split("\n"):
+        key, sep, value = line.partition(":")
+        if not sep:
             continue
-        key, value = line.split(":", 1)
         key = key.strip()
         value = value.strip()
         if value.startswith('"') and value.endswith('"'):
@@ -118,7 +124,7 @@ def get_task_info(project_root: str, task_dir: str) -> dict | None:
             value = True
         elif value == "false":
             value = False
-        elif value.isdigit():
+        elif value.isdecimal():
             value = int(value)
         frontmatter[key] = value
 
@@ -156,17 +162,21 @@ def main():
                 print(f"Phase: {task_info.get('current_phase', '?')}/{task_info.get('max_phases', 5)}")
         sys.exit(0)
 
-    context = get_agent_context(project_root, task_dir, args.agent)
-
     if args.json:
         print(json.dumps({
             "task_dir": task_dir,
             "agent": args.agent,
-            "context": context,
+            "context": get_agent_context(project_root, task_dir, args.agent),
             "task_info": task_info,
         }))
     else:
-        print(context)
+        # Write block by block instead of building the joined context string
+        out = sys.stdout
+        for i, block in enumerate(iter_agent_context(project_root, task_dir, args.agent)):
+            if i:
+                out.write("\n\n")
+            out.write(block)
+        out.write("\n")
 
 
 if __name__ == "__main__":
@@ -11,20 +11,26 @@ Commands:
   update-phase <N>            - Update current phase
 """
 
-import argparse
 import os
-import random
-import re
-import string
-import subprocess
 import sys
-from datetime import datetime
-from pathlib import Path
+import time
 
 # Directory constants
 DIR_TASKS = ".claude/do-tasks"
 FILE_CURRENT_TASK = ".current-task"
 FILE_TASK_MD = "task.md"
+TASK_ID_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+# Frontmatter keys shown by the list command
+LIST_KEYS = frozenset({"id", "title", "status", "current_phase", "max_phases"})
+
+# Frontmatter value formatters keyed by exact type. bool needs its own entry
+# since it subclasses int; strings are always quoted.
+FRONTMATTER_FORMATTERS = {
+    bool: lambda value: "true" if value else "false",
+    int: str,
+    str: lambda value: f'"{value}"',
+}
 
 PHASE_NAMES = {
     1: "Understand",
@@ -35,6 +41,11 @@ PHASE_NAMES = {
 }
 
 
+def get_phase_name(phase: int) -> str:
+    """Get the display name of a phase number."""
+    return PHASE_NAMES.get(phase) or f"Phase {phase}"
+
+
 def get_project_root() -> str:
     """Get project root from env or cwd."""
     return os.environ.get("CLAUDE_PROJECT_DIR", os.getcwd())
@@ -52,86 +63,139 @@ def get_current_task_file(project_root: str) -> str:
 
 def generate_task_id() -> str:
     """Generate short task ID: MMDD-XXXX format."""
-    date_part = datetime.now().strftime("%m%d")
-    random_part = ''.join(random.choices(string.ascii_lowercase + string.digits, k=4))
+    import random
+
+    now = time.localtime()
+    date_part = f"{now.tm_mon:02d}{now.tm_mday:02d}"
+    random_part = ''.join(random.choices(TASK_ID_CHARS, k=4))
     return f"{date_part}-{random_part}"
 
 
-def read_task_md(task_md_path: str) -> dict | None:
-    """Read task.md and parse YAML frontmatter + body."""
-    if not os.path.exists(task_md_path):
-        return None
+def read_task_md(task_md_path: str, keys: frozenset[str] | None = None) -> dict | None:
+    """Read task.md and parse YAML frontmatter + body.
 
+    If keys is given, frontmatter parsing stops once all of them are found.
+    """
     try:
         with open(task_md_path, "r", encoding="utf-8") as f:
             content = f.read()
     except Exception:
         return None
 
-    # Parse YAML frontmatter
-    match = re.match(r'^---\n(.*?)\n---\n(.*)$', content, re.DOTALL)
-    if not match:
+    # Split frontmatter from body by index instead of a regex match
+    if not content.startswith("---\n"):
+        return None
+    end = content.find("\n---\n", 4)
+    if end == -1:
         return None
 
-    frontmatter_str = match.group(1)
-    body = match.group(2)
+    frontmatter_str = content[4:end]
+    body = content[end + 5:]
 
     # Simple YAML parsing (no external deps)
     frontmatter = {}
+    missing = set(keys) if keys is not None else None
     for line in frontmatter_str.split('\n'):
-        if ':' in line:
-            key, value = line.split(':', 1)
-            key = key.strip()
-            value = value.strip()
-            # Handle quoted strings
-            if value.startswith('"') and value.endswith('"'):
-                value = value[1:-1]
-            elif value == 'true':
-                value = True
-            elif value == 'false':
-                value = False
-            elif value.isdigit():
-                value = int(value)
-            frontmatter[key] = value
+        key, sep, value = line.partition(':')
+        if not sep:
+            continue
+        key = key.strip()
+        value = value.strip()
+        if value.startswith('"') and value.endswith('"'):
+            value = value[1:-1]
+        elif value == "true":
+            value = True
+        elif value == "false":
+            value = False
+        elif value.isdecimal():
+            value = int(value)
+        frontmatter[key] = value
+        if missing is not None:
+            missing.discard(key)
+            if not missing:
+                break
 
     return {"frontmatter": frontmatter, "body": body}
 
 
-def write_task_md(task_md_path: str, frontmatter: dict, body: str) -> bool:
-    """Write task.md with YAML frontmatter + body."""
+def format_frontmatter_line(key: str, value) -> str:
+    """Format one frontmatter key/value pair as a YAML line."""
+    formatter = FRONTMATTER_FORMATTERS.get(type(value), str)
+    return f"{key}: {formatter(value)}"
+
+
+def write_file_atomic(path: str, content: str) -> bool:
+    """Write content to path via a sibling temp file and rename."""
+    # Encode once and write raw bytes, bypassing the text layer. Renaming
+    # into place means a crash mid-write never leaves a truncated file.
+    tmp_path = path + ".tmp"
     try:
-        lines = ["---"]
-        for key, value in frontmatter.items():
-            if isinstance(value, bool):
-                lines.append(f"{key}: {str(value).lower()}")
-            elif isinstance(value, int):
-                lines.append(f"{key}: {value}")
-            elif isinstance(value, str) and ('<' in value or '>' in value or ':' in value):
-                lines.append(f'{key}: "{value}"')
-            else:
-                lines.append(f'{key}: "{value}"' if isinstance(value, str) else f"{key}: {value}")
-        lines.append("---")
-        lines.append("")
-        lines.append(body)
-
-        with open(task_md_path, "w", encoding="utf-8") as f:
-            f.write('\n'.join(lines))
+        with open(tmp_path, "wb") as f:
+            f.write(content.encode("utf-8"))
+        os.replace(tmp_path, path)
         return True
     except Exception:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return False
 
 
+def write_task_md(task_md_path: str, frontmatter: dict, body: str) -> bool:
+    """Write task.md with YAML frontmatter + body."""
+    lines = ["---"]
+    for key, value in frontmatter.items():
+        lines.append(format_frontmatter_line(key, value))
+    lines.append("---")
+    lines.append("")
+    lines.append(body)
+    return write_file_atomic(task_md_path, '\n'.join(lines))
+
+
+def patch_frontmatter(content: str, updates: dict) -> str | None:
+    """Set frontmatter keys in task.md content, leaving all other lines as-is.
+
+    Keys not yet present are appended to the frontmatter. Returns None if the
+    content has no frontmatter.
+    """
+    if not content.startswith("---\n"):
+        return None
+    end = content.find("\n---\n", 4)
+    if end == -1:
+        return None
+
+    pending = dict(updates)
+    lines = content[4:end].split('\n')
+    for i, line in enumerate(lines):
+        key, sep, _ = line.partition(':')
+        key = key.strip()
+        if sep and key in updates:
+            lines[i] = format_frontmatter_line(key, updates[key])
+            pending.pop(key, None)
+    for key, value in pending.items():
+        lines.append(format_frontmatter_line(key, value))
+
+    return "---\n" + '\n'.join(lines) + content[end:]
+
+
 def create_worktree(project_root: str, task_id: str) -> str:
     """Create a git worktree for the task. Returns the worktree directory path."""
-    # Get git root
-    result = subprocess.run(
-        ["git", "-C", project_root, "rev-parse", "--show-toplevel"],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError(f"Not a git repository: {project_root}")
-    git_root = result.stdout.strip()
+    import subprocess
+
+    # Get git root. A project root holding .git is its own top level, which
+    # saves spawning git rev-parse; GIT_DIR overrides that discovery.
+    if "GIT_DIR" not in os.environ and os.path.exists(os.path.join(project_root, ".git")):
+        git_root = os.path.realpath(project_root)
+    else:
+        result = subprocess.run(
+            ["git", "-C", project_root, "rev-parse", "--show-toplevel"],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Not a git repository: {project_root}")
+        git_root = result.stdout.strip()
 
     # Calculate paths
     worktree_dir = os.path.join(git_root, ".worktrees", f"do-{task_id}")
@@ -178,7 +242,7 @@ def create_task(title: str, use_worktree: bool = False) -> dict:
         "max_phases": 5,
         "use_worktree": use_worktree,
         "worktree_dir": worktree_dir,
-        "created_at": datetime.now().isoformat(),
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
         "completion_promise": "<promise>DO_COMPLETE</promise>",
     }
 
@@ -237,7 +301,9 @@ def start_task(task_dir: str) -> bool:
             full_path = os.path.join(project_root, task_dir)
             relative_path = task_dir
 
-    if not os.path.exists(full_path):
+    try:
+        os.stat(full_path)
+    except OSError:
         print(f"Error: Task directory not found: {full_path}", file=sys.stderr)
         return False
 
@@ -266,28 +332,34 @@ def list_tasks() -> list[dict]:
     project_root = get_project_root()
     tasks_dir = get_tasks_dir(project_root)
 
-    if not os.path.exists(tasks_dir):
+    # scandir entries carry their file type, saving a stat per entry
+    try:
+        with os.scandir(tasks_dir) as it:
+            entries = sorted(it, key=lambda e: e.name, reverse=True)
+    except FileNotFoundError:
         return []
 
     tasks = []
     current_task = get_current_task(project_root)
 
-    for entry in sorted(os.listdir(tasks_dir), reverse=True):
-        entry_path = os.path.join(tasks_dir, entry)
-        if not os.path.isdir(entry_path):
+    for dir_entry in entries:
+        if not dir_entry.is_dir():
             continue
 
-        task_md_path = os.path.join(entry_path, FILE_TASK_MD)
+        # Plain names under a known directory: concatenation gives the same
+        # result as os.path.join without its per-call normalization
+        task_md_path = f"{dir_entry.path}{os.sep}{FILE_TASK_MD}"
         if not os.path.exists(task_md_path):
             continue
 
-        parsed = read_task_md(task_md_path)
+        entry = dir_entry.name
+        parsed = read_task_md(task_md_path, LIST_KEYS)
         if parsed:
             task_data = parsed["frontmatter"]
         else:
             task_data = {"id": entry, "title": entry, "status": "unknown"}
 
-        relative_path = os.path.join(DIR_TASKS, entry)
+        relative_path = f"{DIR_TASKS}{os.sep}{entry}"
         task_data["path"] = relative_path
         task_data["is_current"] = current_task == relative_path
         tasks.append(task_data)
@@ -327,23 +399,81 @@ def update_phase(phase: int) -> bool:
     task_dir = os.path.join(project_root, current_task)
     task_md_path = os.path.join(task_dir, FILE_TASK_MD)
 
-    parsed = read_task_md(task_md_path)
-    if not parsed:
+    try:
+        with open(task_md_path, "r", encoding="utf-8") as f:
+            content = f.read()
+    except Exception:
+        content = ""
+
+    # Only the two phase lines change: patch them in place instead of
+    # re-serializing the whole document
+    patched = patch_frontmatter(content, {
+        "current_phase": phase,
+        "phase_name": get_phase_name(phase),
+    })
+    if patched is None:
         print("Error: task.md not found or invalid.", file=sys.stderr)
         return False
 
-    frontmatter = parsed["frontmatter"]
-    frontmatter["current_phase"] = phase
-    frontmatter["phase_name"] = PHASE_NAMES.get(phase, f"Phase {phase}")
-
-    if not write_task_md(task_md_path, frontmatter, parsed["body"]):
+    if not write_file_atomic(task_md_path, patched):
         print("Error: Failed to write task.md.", file=sys.stderr)
         return False
 
     return True
 
 
+def cmd_finish():
+    """Clear the current task and report it."""
+    if finish_task():
+        print("Task finished, current task cleared.")
+    else:
+        sys.exit(1)
+
+
+def cmd_list():
+    """Print all tasks, marking the current one."""
+    tasks = list_tasks()
+    if not tasks:
+        print("No tasks found.")
+    else:
+        for task in tasks:
+            marker = "* " if task.get("is_current") else "  "
+            phase = task.get("current_phase", "?")
+            max_phase = task.get("max_phases", 5)
+            status = task.get("status", "unknown")
+            print(f"{marker}{task['id']} [{status}] phase {phase}/{max_phase}")
+            print(f"    {task.get('title', 'No title')}")
+
+
+def cmd_status():
+    """Print the current task's status."""
+    status = get_status()
+    if not status:
+        print("No active task.")
+    else:
+        print(f"Task: {status['id']}")
+        print(f"Title: {status.get('title', 'No title')}")
+        print(f"Status: {status.get('status', 'unknown')}")
+        print(f"Phase: {status.get('current_phase', '?')}/{status.get('max_phases', 5)}")
+        print(f"Worktree: {status.get('use_worktree', False)}")
+        print(f"Path: {status['path']}")
+
+
+# Argument-free commands, dispatched without building the argparse parser
+FAST_COMMANDS = {
+    "finish": cmd_finish,
+    "list": cmd_list,
+    "status": cmd_status,
+}
+
+
 def main():
+    if len(sys.argv) == 2 and sys.argv[1] in FAST_COMMANDS:
+        FAST_COMMANDS[sys.argv[1]]()
+        return
+
+    import argparse
+
     parser = argparse.ArgumentParser(
         description="Task directory management for do skill workflow"
     )
@@ -387,41 +517,12 @@ def main():
         else:
             sys.exit(1)
 
-    elif args.command == "finish":
-        if finish_task():
-            print("Task finished, current task cleared.")
-        else:
-            sys.exit(1)
-
-    elif args.command == "list":
-        tasks = list_tasks()
-        if not tasks:
-            print("No tasks found.")
-        else:
-            for task in tasks:
-                marker = "* " if task.get("is_current") else "  "
-                phase = task.get("current_phase", "?")
-                max_phase = task.get("max_phases", 5)
-                status = task.get("status", "unknown")
-                print(f"{marker}{task['id']} [{status}] phase {phase}/{max_phase}")
-                print(f"    {task.get('title', 'No title')}")
-
-    elif args.command == "status":
-        status = get_status()
-        if not status:
-            print("No active task.")
-        else:
-            print(f"Task: {status['id']}")
-            print(f"Title: {status.get('title', 'No title')}")
-            print(f"Status: {status.get('status', 'unknown')}")
-            print(f"Phase: {status.get('current_phase', '?')}/{status.get('max_phases', 5)}")
-            print(f"Worktree: {status.get('use_worktree', False)}")
-            print(f"Path: {status['path']}")
+    elif args.command in FAST_COMMANDS:
+        FAST_COMMANDS[args.command]()
 
     elif args.command == "update-phase":
         if update_phase(args.phase):
-            phase_name = PHASE_NAMES.get(args.phase, f"Phase {args.phase}")
-            print(f"Updated to phase {args.phase} ({phase_name})")
+            print(f"Updated to phase {args.phase} ({get_phase_name(args.phase)})")
         else:
             sys.exit(1)
 
@@ -14,12 +14,14 @@ Usage:
 import subprocess
 import sys
 import os
+import threading
 
 DEFAULT_MODEL = os.environ.get('GEMINI_MODEL', 'gemini-3-pro-preview')
 DEFAULT_WORKDIR = '.'
 TIMEOUT_MS = 7_200_000  # 固定 2 小时，毫秒
 DEFAULT_TIMEOUT = TIMEOUT_MS // 1000
 FORCE_KILL_DELAY = 5
+CHUNK_SIZE = 65536  # stdout 透传的单次读取上限
 
 
 def log_error(message: str):
@@ -87,22 +89,37 @@ def main():
             gemini_args,
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1  # 行缓冲
+            bufsize=0  # 原始字节管道，按块透传
         )
 
-        # 实时输出 stdout
-        for line in process.stdout:
-            sys.stdout.write(line)
-            sys.stdout.flush()
+        # 后台线程并行读取 stderr，避免其管道写满后子进程阻塞在写 stderr 上
+        stderr_chunks = []
+        stderr_reader = threading.Thread(
+            target=lambda: stderr_chunks.append(process.stderr.read()),
+            daemon=True
+        )
+        stderr_reader.start()
+
+        # 实时输出 stdout：每次转发管道中已有的全部字节，而不是逐行 flush
+        stdout_fd = process.stdout.fileno()
+        out = sys.stdout.buffer
+        while True:
+            chunk = os.read(stdout_fd, CHUNK_SIZE)
+            if not chunk:
+                break
+            out.write(chunk)
+            out.flush()
 
         # 等待进程结束
         returncode = process.wait(timeout=timeout_sec)
 
-        # 读取 stderr
-        stderr_output = process.stderr.read()
+        # 收集 stderr
+        stderr_reader.join()
+        stderr_output = stderr_chunks[0] if stderr_chunks else b''
         if stderr_output:
-            sys.stderr.write(stderr_output)
+            sys.stderr.flush()
+            sys.stderr.buffer.write(stderr_output)
+            sys.stderr.buffer.flush()
 
         # 检查退出码
         if returncode != 0:
@@ -0,0 +1,60 @@
+"""Tests for skills/do/hooks/verify-loop.py."""
+
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+HOOK = os.path.join(os.path.dirname(__file__), "..", "skills", "do", "hooks", "verify-loop.py")
+
+_spec = importlib.util.spec_from_file_location("verify_loop", HOOK)
+verify_loop = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(verify_loop)
+
+
+class GetVerifyCommandsTest(unittest.TestCase):
+    def test_string_is_one_command(self):
+        self.assertEqual(verify_loop.get_verify_commands({"verify_commands": "make test"}), ["make test"])
+
+    def test_blank_string_is_no_command(self):
+        self.assertEqual(verify_loop.get_verify_commands({"verify_commands": "  "}), [])
+
+    def test_list_is_kept(self):
+        commands = ["make lint", "make test"]
+        self.assertEqual(verify_loop.get_verify_commands({"verify_commands": commands}), commands)
+
+    def test_missing_or_scalar_is_no_command(self):
+        self.assertEqual(verify_loop.get_verify_commands({}), [])
+        self.assertEqual(verify_loop.get_verify_commands({"verify_commands": 3}), [])
+
+
+class VerifyHookTest(unittest.TestCase):
+    def test_string_command_runs_once(self):
+        with tempfile.TemporaryDirectory() as root:
+            task_dir = os.path.join(".claude", "do-tasks", "0101-abcd")
+            os.makedirs(os.path.join(root, task_dir))
+            with open(os.path.join(root, ".claude", "do-tasks", ".current-task"), "w") as f:
+                f.write(task_dir)
+            with open(os.path.join(root, task_dir, "task.md"), "w") as f:
+                f.write('---\nid: "0101-abcd"\nverify_commands: "echo run >> runs.txt; exit 3"\n---\n')
+
+            payload = {"hook_event_name": "SubagentStop", "subagent_type": "code-reviewer", "cwd": root}
+            result = subprocess.run(
+                [sys.executable, HOOK],
+                input=json.dumps(payload).encode(),
+                capture_output=True,
+                check=True,
+            )
+
+            output = json.loads(result.stdout)
+            self.assertEqual(output["decision"], "block")
+            self.assertIn("Command failed: echo run >> runs.txt; exit 3", output["reason"])
+            with open(os.path.join(root, "runs.txt")) as f:
+                self.assertEqual(f.read(), "run\n")
+
+
+if __name__ == "__main__":
+    unittest.main()
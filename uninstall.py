@@ -4,18 +4,33 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import functools
 import json
+import os
 import re
 import shutil
+import stat
 import sys
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 DEFAULT_INSTALL_DIR = "~/.claude"
 
+# Repository checkout this script runs from; merge_dir sources live here
+SCRIPT_DIR = Path(__file__).parent
+
 # Files created by installer itself (not by modules)
 INSTALLER_FILES = ["install.log", "installed_modules.json", "installed_modules.json.bak"]
 
+# Operations whose target is exactly what they install
+COPY_OP_TYPES = frozenset({"copy_file", "copy_dir"})
+
+# Shell config lines written by the installer, matched on raw file bytes
+INSTALLER_COMMENT = b"# Added by myclaude installer\n"
+INSTALLER_COMMENT_RE = re.compile(rb"\n?# Added by myclaude installer\n")
+TRAILING_NEWLINES_RE = re.compile(rb"\n{3,}$")
+
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Uninstall myclaude")
@@ -54,29 +69,46 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
 def load_installed_modules(install_dir: Path) -> Dict[str, Any]:
     """Load installed_modules.json to know what was installed."""
     status_file = install_dir / "installed_modules.json"
-    if not status_file.exists():
-        return {}
     try:
-        with status_file.open("r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError):
+        # json.loads decodes UTF-8 bytes itself; skip the text-mode wrapper
+        return json.loads(status_file.read_bytes())
+    except (ValueError, OSError):
         return {}
 
 
+def save_installed_modules(status_file: Path, modules: Dict[str, Any]) -> None:
+    """Rewrite installed_modules.json via a temp file so it is never left truncated.
+
+    The existing file's permission bits are carried over to the new one.
+    """
+    text = json.dumps({"modules": modules}, indent=2)
+    tmp = status_file.with_name(status_file.name + ".tmp")
+    try:
+        mode = stat.S_IMODE(status_file.stat().st_mode)
+    except FileNotFoundError:
+        mode = None
+    try:
+        tmp.write_bytes(text.encode("utf-8"))
+        if mode is not None:
+            os.chmod(tmp, mode)
+        os.replace(tmp, status_file)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
 def load_config(install_dir: Path) -> Dict[str, Any]:
     """Try to load config.json from source repo to understand module structure."""
     # Look for config.json in common locations
     candidates = [
-        Path(__file__).parent / "config.json",
+        SCRIPT_DIR / "config.json",
         install_dir / "config.json",
     ]
     for path in candidates:
-        if path.exists():
-            try:
-                with path.open("r", encoding="utf-8") as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError):
-                continue
+        try:
+            return json.loads(path.read_bytes())
+        except (ValueError, OSError):
+            continue
     return {}
 
 
@@ -88,20 +120,21 @@ def get_module_files(module_name: str, config: Dict[str, Any]) -> Set[str]:
 
     for op in module_cfg.get("operations", []):
         op_type = op.get("type", "")
-        target = op.get("target", "")
 
-        if op_type == "copy_file" and target:
-            files.add(target)
-        elif op_type == "copy_dir" and target:
-            files.add(target)
+        if op_type in COPY_OP_TYPES:
+            target = op.get("target", "")
+            if target:
+                files.add(target)
         elif op_type == "merge_dir":
             # merge_dir merges subdirs like commands/, agents/ into install_dir
             source = op.get("source", "")
-            source_path = Path(__file__).parent / source
-            if source_path.exists():
-                for subdir in source_path.iterdir():
-                    if subdir.is_dir():
-                        files.add(subdir.name)
+            source_path = SCRIPT_DIR / source
+            # scandir entries carry their file type, saving a stat per entry
+            try:
+                with os.scandir(source_path) as it:
+                    files.update(entry.name for entry in it if entry.is_dir())
+            except (FileNotFoundError, NotADirectoryError):
+                pass
         elif op_type == "run_command":
             # install.sh installs bin/codeagent-wrapper
             cmd = op.get("command", "")
@@ -112,30 +145,119 @@ def get_module_files(module_name: str, config: Dict[str, Any]) -> Set[str]:
     return files
 
 
+@functools.lru_cache(maxsize=4)
+def _path_export_re(bin_dir: str) -> re.Pattern:
+    """Compile the PATH export line pattern for bin_dir once per directory."""
+    return re.compile(rb'\nexport PATH="' + re.escape(os.fsencode(bin_dir)) + rb':\$PATH"\n?')
+
+
 def cleanup_shell_config(rc_file: Path, bin_dir: Path) -> bool:
     """Remove PATH export added by installer from shell config."""
-    if not rc_file.exists():
+    # Work on bytes: the markers are ASCII, so nothing needs decoding and
+    # the rest of the file is written back exactly as it was read
+    try:
+        content = rc_file.read_bytes()
+    except FileNotFoundError:
+        return False
+    # Substring checks rule out most files before any regex pass runs
+    export_line = b'\nexport PATH="' + os.fsencode(str(bin_dir)) + b':$PATH"'
+    if INSTALLER_COMMENT not in content and export_line not in content:
         return False
-
-    content = rc_file.read_text(encoding="utf-8")
     original = content
 
-    patterns = [
-        r"\n?# Added by myclaude installer\n",
-        rf'\nexport PATH="{re.escape(str(bin_dir))}:\$PATH"\n?',
-    ]
-
-    for pattern in patterns:
-        content = re.sub(pattern, "\n", content)
+    for pattern in (INSTALLER_COMMENT_RE, _path_export_re(str(bin_dir))):
+        content = pattern.sub(b"\n", content)
 
-    content = re.sub(r"\n{3,}$", "\n\n", content)
+    content = TRAILING_NEWLINES_RE.sub(b"\n\n", content)
 
     if content != original:
-        rc_file.write_text(content, encoding="utf-8")
+        rc_file.write_bytes(content)
         return True
     return False
 
 
+def stat_items(install_dir: Path, items: Set[str]) -> Dict[str, Optional[bool]]:
+    """Map each item to whether it is a directory, or None if it is missing."""
+    root = os.fspath(install_dir)
+    kinds: Dict[str, Optional[bool]] = {}
+    for item in items:
+        # One stat answers both "exists?" and "directory?"
+        try:
+            kinds[item] = stat.S_ISDIR(os.stat(os.path.join(root, item)).st_mode)
+        except (FileNotFoundError, NotADirectoryError):
+            kinds[item] = None
+    return kinds
+
+
+def remove_entry(item: str, path: str, is_dir: bool) -> List[Tuple[str, Optional[str], bool]]:
+    """Remove one item, returning (message, removed name, ok) records to report."""
+    records: List[Tuple[str, Optional[str], bool]] = []
+    try:
+        if is_dir:
+            # Only remove if empty or if it's a known module dir
+            if item in ("bin",):
+                # For bin, only remove codeagent-wrapper
+                try:
+                    os.unlink(os.path.join(path, "codeagent-wrapper"))
+                except FileNotFoundError:
+                    pass
+                else:
+                    records.append(("  ✓ Removed bin/codeagent-wrapper", "bin/codeagent-wrapper", True))
+                # Remove bin if empty
+                try:
+                    os.rmdir(path)
+                except OSError as e:
+                    if e.errno not in (errno.ENOENT, errno.ENOTEMPTY, errno.EEXIST):
+                        raise
+                else:
+                    records.append(("  ✓ Removed empty bin/", None, True))
+            else:
+                shutil.rmtree(path)
+                records.append((f"  ✓ Removed {item}/", item, True))
+        else:
+            os.unlink(path)
+            records.append((f"  ✓ Removed {item}", item, True))
+    except OSError as e:
+        records.append((f"  ✗ Failed to remove {item}: {e}", None, False))
+    return records
+
+
+def remove_items(install_dir: Path, kinds: Dict[str, Optional[bool]]) -> List[str]:
+    """Remove the existing items from a stat_items() map, returning what was removed."""
+    removed: List[str] = []
+    # Depth, name and absolute path are computed once per item. Negated
+    # depth makes the native tuple sort put the deepest items first (files
+    # before parent dirs), then order by name; names are unique, so paths
+    # are never compared.
+    root = os.fspath(install_dir)
+    entries = [
+        (-item.count("/"), item, os.path.join(root, item), is_dir)
+        for item, is_dir in kinds.items()
+        if is_dir is not None
+    ]
+    entries.sort()
+    # Progress lines are written in one go; a failure flushes them first so
+    # stdout and stderr stay in order on a terminal
+    lines: List[str] = []
+
+    def flush_lines() -> None:
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
+            lines.clear()
+
+    for _, item, path, is_dir in entries:
+        for message, name, ok in remove_entry(item, path, is_dir):
+            if ok:
+                lines.append(message)
+            else:
+                flush_lines()
+                print(message, file=sys.stderr)
+            if name is not None:
+                removed.append(name)
+    flush_lines()
+    return removed
+
+
 def list_installed(install_dir: Path) -> None:
     """List installed modules."""
     status = load_installed_modules(install_dir)
@@ -190,13 +312,14 @@ def main(argv: Optional[List[str]] = None) -> int:
         print("Use --list to see installed modules, or --purge to remove everything.")
         return 0
 
-    # Collect files to remove
-    files_to_remove: Set[str] = set()
-    for module_name in selected:
-        files_to_remove.update(get_module_files(module_name, config))
+    # Collect files to remove; a module named twice is only walked once
+    files_to_remove: Set[str] = set().union(
+        *(get_module_files(module_name, config) for module_name in dict.fromkeys(selected))
+    )
 
     # Add installer files if removing all modules
-    if set(selected) == set(installed_modules.keys()):
+    uninstall_all = set(selected) == set(installed_modules)
+    if uninstall_all:
         files_to_remove.update(INSTALLER_FILES)
 
     # Show what will be removed
@@ -205,10 +328,11 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"\n⚠️  PURGE MODE: Will remove ENTIRE directory including user files!")
     else:
         print(f"\nModules to uninstall: {', '.join(selected)}")
+        # Stat each item once; removal reuses the result
+        file_kinds = stat_items(install_dir, files_to_remove)
         print(f"\nFiles/directories to remove:")
-        for f in sorted(files_to_remove):
-            path = install_dir / f
-            exists = "✓" if path.exists() else "✗ (not found)"
+        for f in sorted(file_kinds):
+            exists = "✓" if file_kinds[f] is not None else "✗ (not found)"
             print(f"  {f} {exists}")
 
     # Confirmation
@@ -231,45 +355,16 @@ def main(argv: Optional[List[str]] = None) -> int:
         print(f"  ✓ Removed {install_dir}")
         removed.append(str(install_dir))
     else:
-        # Remove files/dirs in reverse order (files before parent dirs)
-        for item in sorted(files_to_remove, key=lambda x: x.count("/"), reverse=True):
-            path = install_dir / item
-            if not path.exists():
-                continue
-            try:
-                if path.is_dir():
-                    # Only remove if empty or if it's a known module dir
-                    if item in ("bin",):
-                        # For bin, only remove codeagent-wrapper
-                        wrapper = path / "codeagent-wrapper"
-                        if wrapper.exists():
-                            wrapper.unlink()
-                            print(f"  ✓ Removed bin/codeagent-wrapper")
-                            removed.append("bin/codeagent-wrapper")
-                        # Remove bin if empty
-                        if path.exists() and not any(path.iterdir()):
-                            path.rmdir()
-                            print(f"  ✓ Removed empty bin/")
-                    else:
-                        shutil.rmtree(path)
-                        print(f"  ✓ Removed {item}/")
-                        removed.append(item)
-                else:
-                    path.unlink()
-                    print(f"  ✓ Removed {item}")
-                    removed.append(item)
-            except OSError as e:
-                print(f"  ✗ Failed to remove {item}: {e}", file=sys.stderr)
+        removed.extend(remove_items(install_dir, file_kinds))
 
         # Update installed_modules.json
         status_file = install_dir / "installed_modules.json"
-        if status_file.exists() and selected != list(installed_modules.keys()):
+        if not uninstall_all and status_file.exists():
             # Partial uninstall: update status file
             for m in selected:
                 installed_modules.pop(m, None)
             if installed_modules:
-                with status_file.open("w", encoding="utf-8") as f:
-                    json.dump({"modules": installed_modules}, f, indent=2)
+                save_installed_modules(status_file, installed_modules)
                 print(f"  ✓ Updated installed_modules.json")
 
         # Remove install dir if empty